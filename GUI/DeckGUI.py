@@ -21,11 +21,17 @@ class DeckGUI(tk.Toplevel):
         title.pack(pady=10)
 
         # Card count
-        card_count = len(self.deck.cards)
+        card_count = len(self.deck)
         count_label = tk.Label(self, text=f"Total Cards: {card_count}",
                               font=("Arial", 14, "bold"), bg="#2c2c2c", fg="#00ff00")
         count_label.pack(pady=5)
 
+        # Hi-Lo count, read from the deck's running totals
+        hilo_label = tk.Label(self, text=f"Running Count: {self.deck.running_count:+d}   "
+                                         f"True Count: {self.deck.true_count:+.1f}",
+                              font=("Arial", 12), bg="#2c2c2c", fg="white")
+        hilo_label.pack(pady=(0, 5))
+
         # Container frame for cards list
         cards_container = tk.Frame(self, bg="#2c2c2c")
         cards_container.pack(fill="both", expand=True, padx=10, pady=10)
@@ -1,18 +1,28 @@
 import tkinter as tk
 from game.Game import Game
+from game.Messages import describe
+from game.Outcome import Outcome, Transition
 from GUI.DeckGUI import DeckGUI
+from strategy.Expectimax import Expectimax
+from strategy.StrategyTable import StrategyTable
 
 class GameGUI(tk.Tk):
-    def __init__(self):
+    def __init__(self, game=None):
         super().__init__()
         self.title("♠ Blackjack Game ♥")
         self.resizable(False, False)
         self.configure(bg="#1a5f1a")  # green felt background
 
-        self.game = Game(num_slots=7)
+        self.game = game or Game(num_slots=7)  # or a GUI.RemoteGame thin client
         self.player_seat = None  # chosen seat index
+        self.strategy = StrategyTable.load_or_solve(rules=self.game.rules)
+        self.hints = Expectimax(self.strategy)  # answers within ~50 ms, else the table
         self._build_ui()
 
+        if hasattr(self.game, "poll"):
+            self._was_in_round = False
+            self.after(200, self._poll_remote)
+
     def _build_ui(self):
         # Menu bar
         menubar = tk.Menu(self)
@@ -119,10 +129,20 @@ class GameGUI(tk.Tk):
                                      activebackground="#7B1FA2", **button_style)
         self.split_button.grid(row=0, column=3, padx=10)
 
+        self.surrender_button = tk.Button(controls, text="🏳️ SURRENDER", command=self.on_surrender,
+                                         state="disabled", bg="#795548", fg="white",
+                                         activebackground="#5D4037", **button_style)
+        self.surrender_button.grid(row=0, column=4, padx=10)
+
         self.newgame_button = tk.Button(controls, text="🔄 NEW ROUND", command=self.start_new_round,
                                        state="disabled", bg="#2196F3", fg="white",
                                        activebackground="#0b7dda", **button_style)
-        self.newgame_button.grid(row=0, column=4, padx=10)
+        self.newgame_button.grid(row=0, column=5, padx=10)
+
+        self.hint_button = tk.Button(controls, text="💡 HINT", command=self.on_hint,
+                                    bg="#607D8B", fg="white",
+                                    activebackground="#455A64", **button_style)
+        self.hint_button.grid(row=0, column=6, padx=10)
 
     def choose_seat(self, idx):
         if self.player_seat is None:
@@ -141,7 +161,7 @@ class GameGUI(tk.Tk):
                 self.newgame_button.config(state="normal")
 
     def start_new_round(self):
-        message = self.game.new_round()
+        result = self.game.new_round()
 
         # If dealer or player has blackjack, show all cards immediately
         if self.game.dealer_has_blackjack or self.game.player_has_blackjack:
@@ -155,192 +175,181 @@ class GameGUI(tk.Tk):
         self.split_button.config(state="normal")
         #self.newgame_button.config(state="disabled")
 
-        # Check if split is actually available
+        self.surrender_button.config(state="disabled")
+
+        # Check if split and surrender are actually available
         if self.player_seat is not None:
             player = self.game.slots[self.player_seat]
             if player and not player.can_split():
                 self.split_button.config(state="disabled")
+            if player and player.can_surrender():
+                self.surrender_button.config(state="normal")
 
-        if message:
-            # Determine color and icon based on outcome
-            if "win" in message.lower() and "blackjack" in message.lower():
-                color = "#FFD700"  # gold for blackjack win
-                icon = "🎉"
-            elif "push" in message.lower():
-                color = "yellow"
-                icon = "🤝"
-            else:  # dealer blackjack
-                color = "#ff6666"
-                icon = "😔"
-
-            self.status.config(text=f"{icon} {message}", fg=color)
-            self.update_ui(hide_dealer=False)
-            self.hit_button.config(state="disabled")
-            self.stand_button.config(state="disabled")
-            self.double_button.config(state="disabled")
-            self.split_button.config(state="disabled")
-            self.newgame_button.config(state="normal")
+        if result.transition == Transition.ROUND_OVER:
+            self._show_round_over(result)
         else:
             self.status.config(text="🎮 Round started! Choose HIT, STAND, DOUBLE, or SPLIT.", fg="#00ff00")
 
     def on_hit(self):
-        message = self.game.player_hit(self.player_seat)
+        result = self.game.player_hit(self.player_seat)
         self.update_ui(hide_dealer=True)
 
-        # After first hit, can't double or split anymore
+        # After first hit, can't double, split or surrender anymore
         self.double_button.config(state="disabled")
         self.split_button.config(state="disabled")
+        self.surrender_button.config(state="disabled")
 
-        if message:
-            # Check if it's a split hand transition message
-            if "split hand" in message.lower() and "playing" in message.lower():
-                self.status.config(text=f"🔄 {message}", fg="#FFD700")
-                self.update_ui(hide_dealer=True)
-                # Re-enable double if we can
-                if self.player_seat is not None:
-                    player = self.game.slots[self.player_seat]
-                    if player and player.can_double():
-                        self.double_button.config(state="normal")
-            elif "double down complete" in message.lower():
-                self.status.config(text=f"💰 {message}", fg="#FFD700")
-                self.update_ui(hide_dealer=True)
-            elif any(outcome in message.lower() for outcome in ["win", "lose", "push", "dealer"]):
-                # This is a final result message (e.g., from dealer_play after second hand busts)
-                self.update_ui(hide_dealer=False)
-
-                # Determine color based on outcome
-                if "blackjack" in message.lower() and "dealer" in message.lower():
-                    color = "#ff6666"
-                    icon = "😔"
-                elif "win" in message.lower():
-                    color = "#00ff00"
-                    icon = "🎉"
-                elif "lose" in message.lower() or ("busted" in message.lower() and "both" in message.lower()):
-                    color = "#ff6666"
-                    icon = "😔"
-                else:
-                    color = "yellow"
-                    icon = "🤝"
-
-                self.status.config(text=f"{icon} {message}", fg=color)
-                self.hit_button.config(state="disabled")
-                self.stand_button.config(state="disabled")
-                self.newgame_button.config(state="normal")
-            else:
-                # Single hand bust
-                self.status.config(text=f"💥 {message}", fg="#ff6666")
-                self.update_ui(hide_dealer=False)
-                self.hit_button.config(state="disabled")
-                self.stand_button.config(state="disabled")
-                self.newgame_button.config(state="normal")
-        else:
+        if result.transition == Transition.CONTINUE:
             self.status.config(text="🃏 Card dealt! HIT again or STAND.", fg="#00ff00")
+        elif result.transition == Transition.NEXT_HAND:
+            self._show_next_hand(result, "🔄")
+        elif result.transition == Transition.SEAT_DONE:
+            self._show_seat_done(result)
+        elif result.transition == Transition.ROUND_OVER:
+            self._show_round_over(result)
 
     def on_stand(self):
-        message = self.game.player_stand(self.player_seat)
+        result = self.game.player_stand(self.player_seat)
         self.update_ui(hide_dealer=False)
 
-        # Disable double and split once we stand
+        # Disable double, split and surrender once we stand
         self.double_button.config(state="disabled")
         self.split_button.config(state="disabled")
+        self.surrender_button.config(state="disabled")
 
-        if message:
-            # Check if it's a split hand transition message
-            if "split hand" in message.lower() and "playing" in message.lower():
-                self.status.config(text=f"🔄 {message}", fg="#FFD700")
-                self.update_ui(hide_dealer=True)
-                # Re-enable buttons for second hand
-                self.hit_button.config(state="normal")
-                self.stand_button.config(state="normal")
-                if self.player_seat is not None:
-                    player = self.game.slots[self.player_seat]
-                    if player and player.can_double():
-                        self.double_button.config(state="normal")
-                return
-
-            # Determine color based on outcome
-            if "blackjack" in message.lower() and "dealer" in message.lower():
-                color = "#ff6666"  # red for dealer blackjack
-                icon = "😔"
-            elif "win" in message.lower():
-                color = "#00ff00"  # green
-                icon = "🎉"
-            elif "lose" in message.lower() or "busted" in message.lower():
-                color = "#ff6666"  # red
-                icon = "😔"
-            else:
-                color = "yellow"  # tie/push
-                icon = "🤝"
-
-            self.status.config(text=f"{icon} {message}", fg=color)
-            self.hit_button.config(state="disabled")
-            self.stand_button.config(state="disabled")
-            self.newgame_button.config(state="normal")
+        if result.transition == Transition.NEXT_HAND:
+            self.update_ui(hide_dealer=True)
+            self._show_next_hand(result, "🔄")
+        elif result.transition == Transition.SEAT_DONE:
+            self.update_ui(hide_dealer=True)
+            self._show_seat_done(result)
+        elif result.transition == Transition.ROUND_OVER:
+            self._show_round_over(result)
 
     def on_double(self):
         """Handle double down action"""
-        message = self.game.player_double(self.player_seat)
+        result = self.game.player_double(self.player_seat)
 
         # Disable all action buttons immediately
         self.double_button.config(state="disabled")
         self.split_button.config(state="disabled")
+        self.surrender_button.config(state="disabled")
 
-        if message:
-            if "cannot" in message.lower():
-                self.status.config(text=f"❌ {message}", fg="#ff6666")
-            elif "split hand" in message.lower() and "playing" in message.lower():
-                # Transitioning to second split hand
-                self.update_ui(hide_dealer=True)
-                self.status.config(text=f"💰 {message}", fg="#FFD700")
-                # Re-enable buttons for second hand
-                self.hit_button.config(state="normal")
-                self.stand_button.config(state="normal")
-                if self.player_seat is not None:
-                    player = self.game.slots[self.player_seat]
-                    if player and player.can_double():
-                        self.double_button.config(state="normal")
-            else:
-                # Game over - dealer has played
-                self.update_ui(hide_dealer=False)
-
-                # Determine color based on outcome
-                if "blackjack" in message.lower() and "dealer" in message.lower():
-                    color = "#ff6666"
-                    icon = "😔"
-                elif "win" in message.lower():
-                    color = "#00ff00"
-                    icon = "🎉"
-                elif "lose" in message.lower() or "busted" in message.lower():
-                    color = "#ff6666"
-                    icon = "😔"
-                else:
-                    color = "yellow"
-                    icon = "🤝"
-
-                self.status.config(text=f"{icon} {message}", fg=color)
-                self.hit_button.config(state="disabled")
-                self.stand_button.config(state="disabled")
-                self.newgame_button.config(state="normal")
-        else:
-            self.status.config(text="💰 Doubled down! One card dealt, automatically standing...", fg="#FFD700")
+        if result.transition == Transition.INVALID:
+            message = describe(self.game, self.player_seat, result, "double")
+            self.status.config(text=f"❌ {message}", fg="#ff6666")
+        elif result.transition == Transition.NEXT_HAND:
+            # Transitioning to second split hand
+            self.update_ui(hide_dealer=True)
+            self._show_next_hand(result, "💰")
+        elif result.transition == Transition.SEAT_DONE:
+            self.update_ui(hide_dealer=True)
+            self._show_seat_done(result)
+        elif result.transition == Transition.ROUND_OVER:
+            self._show_round_over(result)
 
     def on_split(self):
         """Handle split action"""
-        message = self.game.player_split(self.player_seat)
+        result = self.game.player_split(self.player_seat)
         self.update_ui(hide_dealer=True)
 
-        if message:
-            if "cannot" in message.lower():
-                self.status.config(text=f"❌ {message}", fg="#ff6666")
-            else:
-                self.status.config(text=f"✂️ {message}", fg="#FFD700")
-                # Disable split button (can only split once)
-                self.split_button.config(state="disabled")
-                # Keep other buttons enabled for first hand
-                if self.player_seat is not None:
-                    player = self.game.slots[self.player_seat]
-                    if player and not player.can_double():
-                        self.double_button.config(state="disabled")
+        if result.transition == Transition.INVALID:
+            message = describe(self.game, self.player_seat, result, "split")
+            self.status.config(text=f"❌ {message}", fg="#ff6666")
+        elif result.transition == Transition.SPLIT:
+            message = describe(self.game, self.player_seat, result)
+            self.status.config(text=f"✂️ {message}", fg="#FFD700")
+            self.surrender_button.config(state="disabled")
+            # Keep other buttons enabled for first hand; resplit if the rules allow
+            if self.player_seat is not None:
+                player = self.game.slots[self.player_seat]
+                if player and not player.can_double():
+                    self.double_button.config(state="disabled")
+                if player and not player.can_split():
+                    self.split_button.config(state="disabled")
+
+    def on_surrender(self):
+        """Give up the hand for half the bet"""
+        result = self.game.player_surrender(self.player_seat)
+
+        if result.transition == Transition.INVALID:
+            message = describe(self.game, self.player_seat, result, "surrender")
+            self.status.config(text=f"❌ {message}", fg="#ff6666")
+            return
+
+        self.update_ui(hide_dealer=True)
+        self.double_button.config(state="disabled")
+        self.split_button.config(state="disabled")
+        self.surrender_button.config(state="disabled")
+        if result.transition == Transition.SEAT_DONE:
+            self._show_seat_done(result)
+        elif result.transition == Transition.ROUND_OVER:
+            self._show_round_over(result)
+
+    def _show_next_hand(self, result, icon):
+        """Moved on to the split hand: re-enable the buttons for it"""
+        message = describe(self.game, self.player_seat, result)
+        self.status.config(text=f"{icon} {message}", fg="#FFD700")
+        self.hit_button.config(state="normal")
+        self.stand_button.config(state="normal")
+        player = self.game.slots[self.player_seat]
+        if player and player.can_double():
+            self.double_button.config(state="normal")
+        if player and player.can_split():
+            self.split_button.config(state="normal")
+
+    def _show_seat_done(self, result):
+        """Our seat is finished but other seats still have to act"""
+        message = describe(self.game, self.player_seat, result)
+        self.status.config(text=f"⏳ {message}", fg="yellow")
+        self.hit_button.config(state="disabled")
+        self.stand_button.config(state="disabled")
+
+    def _show_round_over(self, result):
+        """Reveal the dealer and show the settled result of our seat"""
+        self.update_ui(hide_dealer=False)
+        message = describe(self.game, self.player_seat, result)
+
+        # Colour and icon follow the seat's net over all its hands
+        if result.net > 0 and Outcome.BLACKJACK in result.outcomes:
+            color = "#FFD700"  # gold for blackjack win
+            icon = "🎉"
+        elif result.net > 0:
+            color = "#00ff00"  # green
+            icon = "🎉"
+        elif result.net < 0:
+            color = "#ff6666"  # red
+            icon = "😔"
+        else:
+            color = "yellow"  # tie/push
+            icon = "🤝"
+
+        self.status.config(text=f"{icon} {message}", fg=color)
+        self.hit_button.config(state="disabled")
+        self.stand_button.config(state="disabled")
+        self.double_button.config(state="disabled")
+        self.split_button.config(state="disabled")
+        self.surrender_button.config(state="disabled")
+        self.newgame_button.config(state="normal")
+
+    def on_hint(self):
+        """Show the best action for the active hand, searched over the
+        cards left in the shoe (basic strategy if the search is too slow)"""
+        player = self.game.slots[self.player_seat] if self.player_seat is not None else None
+        if not self.game.in_round or not player or player.finished:
+            self.status.config(text="💡 Start a round to get a hint.", fg="yellow")
+            return
+
+        if self.hints.rules != self.game.rules:  # a remote table's rules arrive on joining
+            self.strategy = StrategyTable.load_or_solve(rules=self.game.rules)
+            self.hints = Expectimax(self.strategy)
+        advice = self.hints.advise(self.game, self.player_seat)
+        if advice is None:
+            self.status.config(text="💡 Wait for your turn to get a hint.", fg="yellow")
+            return
+        source = "basic strategy" if advice.depth is None else "this shoe"
+        self.status.config(text=f"💡 Hint: {advice.action.upper()} "
+                                f"(EV {advice.evs[advice.action]:+.3f}, {source})", fg="#FFD700")
 
     def update_ui(self, hide_dealer=True):
         dealer = self.game.dealer
@@ -368,29 +377,16 @@ class GameGUI(tk.Tk):
             if player:
                 # Check if player has split
                 if player.split_hand is not None:
-                    # Show both hands
-                    hand1_str = ", ".join(str(c) for c in player.hand)
-                    hand2_str = ", ".join(str(c) for c in player.split_hand)
-
-                    # Calculate hand values
-                    hand1_val = player.calculate_value()
-
-                    split_total = sum(card.value for card in player.split_hand)
-                    split_aces = sum(1 for c in player.split_hand if c.rank == "A")
-                    split_values = {split_total}
-                    for _ in range(split_aces):
-                        split_total -= 10
-                        split_values.add(split_total)
-                    split_non_bust = [v for v in split_values if v <= 21]
-                    hand2_val = max(split_non_bust) if split_non_bust else min(split_values)
-
-                    # Highlight active hand
-                    if player.active_hand == 0:
-                        player_cards = f"▶ Hand 1: {hand1_str}\n  Hand 2: {hand2_str}"
-                        value_text = f"Hand 1: {hand1_val} | Hand 2: {hand2_val}"
-                    else:
-                        player_cards = f"  Hand 1: {hand1_str}\n▶ Hand 2: {hand2_str}"
-                        value_text = f"Hand 1: {hand1_val} | Hand 2: {hand2_val}"
+                    # Show every hand, highlighting the active one
+                    lines = []
+                    values = []
+                    for index, hand in enumerate(player.hands):
+                        marker = "▶" if index == player.active_hand else " "
+                        cards = ", ".join(str(c) for c in hand)
+                        lines.append(f"{marker} Hand {index + 1}: {cards}")
+                        values.append(f"Hand {index + 1}: {hand.best_value()}")
+                    player_cards = "\n".join(lines)
+                    value_text = " | ".join(values)
 
                     self.player_cards_label.config(text=player_cards)
                     self.player_value_label.config(text=value_text, fg="yellow")
@@ -415,6 +411,19 @@ class GameGUI(tk.Tk):
                         else:
                             self.player_value_label.config(text=f"Value: {player_score}", fg="yellow")
 
+    def _poll_remote(self):
+        """Pick up table changes made by other seats or the server's timer"""
+        if self.game.poll():
+            if self._was_in_round and not self.game.in_round and self.player_seat in self.game.results:
+                self._show_round_over(self.game.results[self.player_seat])
+            else:
+                self.update_ui(hide_dealer=self.game.in_round)
+        self._was_in_round = self.game.in_round
+        self.after(200, self._poll_remote)
+
     def show_deck_window(self):
         """Open a new window to display all cards remaining in the deck"""
+        if self.game.deck is None:
+            self.status.config(text="🃏 The deck is kept by the table server.", fg="yellow")
+            return
         DeckGUI(self, self.game.deck)
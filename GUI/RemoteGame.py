@@ -0,0 +1,106 @@
+import select
+import socket
+
+from entities.Player import Player
+from game.Outcome import IGNORED
+from game.Rules import Rules
+from server import Protocol
+
+
+class RemoteError(Exception):
+    """The table server refused a request"""
+
+
+class RemoteGame:
+    """Client-side stand-in for game.Game at a server.TableServer table.
+
+    Exposes the attributes and actions GameGUI uses; every action is a
+    blocking request whose reply carries the new table state. State pushed
+    by the server for other seats is picked up by poll().
+    """
+
+    def __init__(self, host, port, table_id="main", num_slots=7):
+        self.table_id = table_id
+        self.deck = None  # the shoe stays on the server
+        self.rules = Rules()  # replaced by the table's with the first state
+        self.dealer = Player("Dealer")
+        self.slots = [None] * num_slots
+        self.in_round = False
+        self.turn = None
+        self.results = {}
+        self.dealer_has_blackjack = False
+        self.player_has_blackjack = False
+        self.cards_left = 0
+        self._sock = socket.create_connection((host, port))
+        self._buffer = b""
+        self._next_id = 0
+
+    def _request(self, op, **fields):
+        self._next_id += 1
+        self._sock.sendall(Protocol.encode(dict(fields, id=self._next_id, op=op)))
+        while True:
+            message = self._read()
+            if message.get("id") == self._next_id:
+                break
+        if "state" in message:
+            Protocol.apply_state(self, message["state"])
+        if not message["ok"]:
+            raise RemoteError(message["error"])
+        return message["result"]
+
+    def _read(self, block=True):
+        """Next message from the server (None if ``block`` is False and
+        nothing is waiting); state pushes are applied on the way"""
+        while b"\n" not in self._buffer:
+            if not block and not select.select([self._sock], [], [], 0)[0]:
+                return None
+            chunk = self._sock.recv(1 << 16)
+            if not chunk:
+                raise ConnectionError("table server closed the connection")
+            self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        message = Protocol.decode(line)
+        if message.get("event") == "state":
+            Protocol.apply_state(self, message["state"])
+        return message
+
+    def poll(self):
+        """Apply state pushed by the server; True if anything arrived"""
+        changed = False
+        while self._read(block=False) is not None:
+            changed = True
+        return changed
+
+    def sit_down(self, seat_index, name="You"):
+        try:
+            self._request("join", table=self.table_id, seat=seat_index, name=name)
+        except RemoteError:
+            return False
+        return True
+
+    def place_bet(self, seat_index, amount):
+        return self._request("bet", amount=amount)
+
+    def new_round(self):
+        try:
+            return Protocol.decode_result(self._request("new_round"))
+        except RemoteError:
+            return IGNORED  # another seat already started this round
+
+    def player_hit(self, seat_index):
+        return Protocol.decode_result(self._request("hit"))
+
+    def player_stand(self, seat_index):
+        return Protocol.decode_result(self._request("stand"))
+
+    def player_double(self, seat_index):
+        return Protocol.decode_result(self._request("double"))
+
+    def player_split(self, seat_index):
+        return Protocol.decode_result(self._request("split"))
+
+    def player_surrender(self, seat_index):
+        return Protocol.decode_result(self._request("surrender"))
+
+    def close(self):
+        self._sock.close()
@@ -0,0 +1,155 @@
+import glob
+import os
+import struct
+import time
+from collections import namedtuple
+
+from game.Rules import Rules
+
+# Event kinds
+SHUFFLE = 0  # shoe rebuilt; value = number of decks
+ROUND = 1  # round started; value = seats in play
+DEAL = 2  # card dealt; code = Card.index, seat -1 is the dealer
+ACTION = 3  # player action; code = index into ACTIONS
+SETTLE = 4  # hand settled; code = Outcome, value = net in half units
+
+ACTIONS = ("hit", "stand", "double", "split", "surrender")
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+# Fixed-width little-endian record:
+# time_ns, round, kind, seat, hand, code, value
+RECORD = struct.Struct("<QIBbBBh")
+MAGIC = b"BJLOG\x00\x02\x00"  # file header: format name and version
+# then the Rules.key of the table: decks, H17, DAS, max hands, surrender
+RULES = struct.Struct("<B??B?")
+HEADER_SIZE = len(MAGIC) + RULES.size
+SUFFIX = ".bjlog"
+
+Event = namedtuple("Event", ("time_ns", "round", "kind", "seat", "hand", "code", "value"))
+
+
+class EventLog:
+    """Append-only binary audit log of deals, actions and settlements.
+
+    Records are packed into an in-memory buffer and written out when it is
+    full, so a crash loses at most ``buffer_records`` events. Files are
+    ``<prefix>.00000.bjlog``, ``<prefix>.00001.bjlog`` ...; a new one is
+    started once the current file reaches ``max_bytes``, numbered after
+    the highest existing one. Every file header holds the table's
+    game.Rules.Rules ``rules``, so a log replays without being told them.
+    """
+
+    def __init__(self, prefix, max_bytes=64 << 20, buffer_records=4096, rules=None):
+        self.prefix = prefix
+        self.rules = rules or Rules()
+        self.max_bytes = max_bytes
+        self._buffer = bytearray(RECORD.size * buffer_records)
+        self._used = 0
+        self._file = None
+        self._file_bytes = 0
+        files = log_files(prefix)
+        self._index = _file_index(files[-1]) + 1 if files else 0  # continue after them
+        self._open_next()
+
+    def _open_next(self):
+        if self._file is not None:
+            self._file.close()
+        path = f"{self.prefix}.{self._index:05d}{SUFFIX}"
+        self._index += 1
+        self._file = open(path, "xb")  # never append to another log's file
+        self._file.write(MAGIC + RULES.pack(*self.rules.key))
+        self._file_bytes = HEADER_SIZE
+
+    def record(self, round_number, kind, seat=-1, hand=0, code=0, value=0):
+        if self._used == len(self._buffer):
+            self.flush()
+        RECORD.pack_into(self._buffer, self._used, time.time_ns(), round_number,
+                         kind, seat, hand, code, value)
+        self._used += RECORD.size
+
+    def shuffle(self, round_number, num_decks):
+        self.record(round_number, SHUFFLE, value=num_decks)
+
+    def round(self, round_number, seats):
+        self.record(round_number, ROUND, value=seats)
+
+    def deal(self, round_number, seat, hand, card):
+        self.record(round_number, DEAL, seat, hand, card.index)
+
+    def action(self, round_number, seat, hand, action):
+        self.record(round_number, ACTION, seat, hand, ACTION_CODES[action])
+
+    def settle(self, round_number, seat, hand, outcome, net):
+        self.record(round_number, SETTLE, seat, hand, int(outcome), round(net * 2))
+
+    def flush(self):
+        if not self._used:
+            return
+        if self._file_bytes + self._used > self.max_bytes and self._file_bytes > HEADER_SIZE:
+            self._open_next()
+        self._file.write(memoryview(self._buffer)[:self._used])
+        self._file.flush()
+        self._file_bytes += self._used
+        self._used = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def log_files(prefix):
+    """All files of a log, oldest first"""
+    return sorted(glob.glob(glob.escape(prefix) + ".[0-9][0-9][0-9][0-9][0-9]" + SUFFIX))
+
+
+def _file_index(path):
+    return int(path[-len(SUFFIX) - 5:-len(SUFFIX)])
+
+
+def _read_header(f, path):
+    header = f.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError(f"{path} is not an event log")
+    return Rules(*RULES.unpack_from(header, len(MAGIC)))
+
+
+def log_rules(prefix):
+    """The game.Rules.Rules a log was recorded under"""
+    rules = set()
+    for path in log_files(prefix):
+        with open(path, "rb") as f:
+            rules.add(_read_header(f, path))
+    if len(rules) != 1:
+        raise ValueError(f"{prefix}: no event log" if not rules
+                         else f"{prefix}: files were recorded under different rules")
+    return rules.pop()
+
+
+def read_events(prefix, chunk_records=8192):
+    """Stream every Event of a log in the order it was written"""
+    for path in log_files(prefix):
+        with open(path, "rb") as f:
+            _read_header(f, path)
+            tail = b""
+            while True:
+                chunk = f.read(RECORD.size * chunk_records)
+                if not chunk:
+                    break
+                data = tail + chunk
+                usable = len(data) - len(data) % RECORD.size
+                for fields in RECORD.iter_unpack(data[:usable]):
+                    yield Event(*fields)
+                tail = data[usable:]
+            if tail:
+                raise ValueError(f"{path} ends with a truncated record")
+
+
+def remove_log(prefix):
+    for path in log_files(prefix):
+        os.remove(path)
@@ -0,0 +1,155 @@
+import time
+from collections import namedtuple
+
+from audit.EventLog import (
+    ACTION, ACTION_CODES, ACTIONS, DEAL, ROUND, SETTLE, log_rules, read_events,
+)
+from entities.Card import Card
+from game.Game import Game
+
+Divergence = namedtuple("Divergence", ("round", "reason", "expected", "actual"))
+
+
+class StackedDeck:
+    """Shoe that deals a fixed sequence of cards, for re-executing a round"""
+
+    continuous = False
+
+    def __init__(self, cards):
+        self.num_decks = 0
+        self.cards = list(reversed(cards))  # last is dealt next, as in Deck
+
+    def deal_card(self):
+        if not self.cards:
+            raise IndexError("replay needs more cards than were recorded")
+        return self.cards.pop()
+
+    def needs_shuffle(self):
+        return False
+
+    def __len__(self):
+        return len(self.cards)
+
+
+class _EventCapture:
+    """Collects the events a replayed Game emits, encoded like EventLog"""
+
+    def __init__(self):
+        self.events = []
+
+    def shuffle(self, round_number, num_decks):
+        pass
+
+    def round(self, round_number, seats):
+        pass
+
+    def deal(self, round_number, seat, hand, card):
+        self.events.append((DEAL, seat, hand, card.index, 0))
+
+    def action(self, round_number, seat, hand, action):
+        self.events.append((ACTION, seat, hand, ACTION_CODES[action], 0))
+
+    def settle(self, round_number, seat, hand, outcome, net):
+        self.events.append((SETTLE, seat, hand, int(outcome), round(net * 2)))
+
+
+class ReplayReport:
+    def __init__(self):
+        self.rounds = 0
+        self.divergences = []
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not self.divergences
+
+    def __str__(self):
+        lines = [f"Replayed {self.rounds} rounds in {self.elapsed:.2f}s, "
+                 f"{len(self.divergences)} divergent"]
+        for divergence in self.divergences[:20]:
+            lines.append(f"  round {divergence.round}: {divergence.reason} "
+                         f"(recorded {divergence.expected}, replayed {divergence.actual})")
+        return "\n".join(lines)
+
+
+def recorded_rounds(events):
+    """Group an event stream into (round number, [events]) per round"""
+    current = None
+    round_events = []
+    for event in events:
+        if event.kind == ROUND:
+            if current is not None:
+                yield current, round_events
+            current, round_events = event.round, []
+        elif current is not None and event.round == current:
+            round_events.append(event)
+    if current is not None:
+        yield current, round_events
+
+
+def replay_round(round_number, events, num_slots=7, rules=None):
+    """Re-execute one recorded round under the table's ``rules`` (see
+    audit.EventLog.log_rules); returns a Divergence or None"""
+    recorded = [(e.kind, e.seat, e.hand, e.code, e.value) for e in events
+                if e.kind in (DEAL, ACTION, SETTLE)]
+    seats = sorted({e.seat for e in events if e.kind == DEAL and e.seat >= 0})
+    cards = [Card.ALL[e.code] for e in events if e.kind == DEAL]
+
+    capture = _EventCapture()
+    game = Game(num_slots=max([num_slots] + [seat + 1 for seat in seats]),
+                deck=StackedDeck(cards), event_log=capture, rules=rules)
+    for seat in seats:
+        game.sit_down(seat)
+    game.round_number = round_number - 1
+
+    try:
+        game.new_round()
+        for event in events:
+            if event.kind != ACTION:
+                continue
+            if game.turn != event.seat:
+                return Divergence(round_number, "action out of turn", event.seat, game.turn)
+            getattr(game, "player_" + ACTIONS[event.code])(event.seat)
+    except IndexError as exc:
+        return Divergence(round_number, str(exc), len(cards), None)
+
+    if game.in_round:
+        return Divergence(round_number, "round did not finish", "settled", "in progress")
+    for index, (expected, actual) in enumerate(zip(recorded, capture.events)):
+        if expected != actual:
+            return Divergence(round_number, f"event {index} differs", expected, actual)
+    if len(recorded) != len(capture.events):
+        return Divergence(round_number, "different number of events",
+                          len(recorded), len(capture.events))
+    return None
+
+
+def replay(prefix, num_slots=7):
+    """Replay every round of the event log at ``prefix`` under the rules
+    recorded in its header"""
+    report = ReplayReport()
+    start = time.perf_counter()
+    rules = log_rules(prefix)
+    for round_number, events in recorded_rounds(read_events(prefix)):
+        divergence = replay_round(round_number, events, num_slots, rules)
+        if divergence is not None:
+            report.divergences.append(divergence)
+        report.rounds += 1
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-execute and verify a recorded event log")
+    parser.add_argument("prefix", help="log prefix, as passed to EventLog")
+    args = parser.parse_args()
+
+    report = replay(args.prefix)
+    print(report)
+    raise SystemExit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
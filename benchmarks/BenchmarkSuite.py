@@ -0,0 +1,332 @@
+"""Micro and macro benchmarks for the engine and GUI hot paths.
+
+    python -m benchmarks.BenchmarkSuite                    # compare with baselines
+    python -m benchmarks.BenchmarkSuite --update-baselines # record new baselines
+
+Each benchmark reports the fastest time per operation over repeated
+samples; the minimum is far less sensitive to scheduler noise than the mean.
+A result slower than its baseline by more than ``--threshold`` is measured
+``--confirm`` more times and is a regression, making the run exit non-zero,
+only if the median of its passes is still that slow. New baselines are the
+median of as many passes. GUI benchmarks need tkinter and
+a display; without DISPLAY an Xvfb server is started if one is installed,
+otherwise they are skipped.
+"""
+import gc
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import time
+
+from entities.Card import Card
+from entities.Deck import Deck
+from entities.Player import Player
+from game.Game import Game
+from simulation.Simulator import Simulator, SimulationResult
+from strategy.StrategyTable import basic_strategy_policy
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+BENCHMARKS = []
+
+
+def benchmark(name, ops=1):
+    """Register ``fn(state)`` as a benchmark doing ``ops`` operations per call.
+    The decorated function is the setup: it returns (fn, state) for a sample
+    and runs outside the timed region."""
+    def register(setup):
+        BENCHMARKS.append((name, ops, setup))
+        return setup
+    return register
+
+
+def measure(setup, ops, min_time=0.05, min_samples=5):
+    """Best seconds per operation over the samples. Sampling stops after
+    ``min_time`` of timed work, or a few times that much wall time when the
+    untimed setup dominates."""
+    samples = []
+    spent = 0.0
+    deadline = time.perf_counter() + 4 * min_time
+    collecting = gc.isenabled()
+    gc.disable()  # as timeit does, so collections do not land in a sample
+    try:
+        while len(samples) < min_samples or (spent < min_time and time.perf_counter() < deadline):
+            fn, state = setup()
+            start = time.perf_counter()
+            fn(state)
+            elapsed = time.perf_counter() - start
+            samples.append(elapsed / ops)
+            spent += elapsed
+    finally:
+        if collecting:
+            gc.enable()
+    return min(samples)
+
+
+def _rng():
+    return random.Random(1234)
+
+
+def _repeat(method, times):
+    def run(obj):
+        for _ in range(times):
+            method(obj)
+    return run
+
+
+@benchmark("Deck.build", ops=20)
+def _deck_build():
+    return _repeat(Deck.build, 20), Deck(num_decks=5, rng=_rng())
+
+
+@benchmark("Deck.shuffle", ops=20)
+def _deck_shuffle():
+    return _repeat(Deck.shuffle, 20), Deck(num_decks=5, rng=_rng())
+
+
+@benchmark("Deck.deal_card", ops=250)
+def _deck_deal():
+    def deal(deck):
+        for _ in range(250):
+            deck.deal_card()
+    return deal, Deck(num_decks=5, rng=_rng())
+
+
+def _varied_players():
+    """Hard, soft, multi-ace, split-sized and busted hands"""
+    hands = [("10", "7"), ("A", "6"), ("A", "A", "9"), ("A", "A", "A", "A", "5"),
+             ("5", "5"), ("K", "Q", "5"), ("2", "3", "A", "4", "A", "6"), ("A", "K")]
+    players = []
+    for ranks in hands:
+        player = Player("Bench")
+        for rank in ranks:
+            player.add_card(Card("Spades", rank))
+        players.append(player)
+    return players * 16
+
+
+@benchmark("Player.possible_values", ops=128)
+def _possible_values():
+    def run(players):
+        for player in players:
+            player.possible_values()
+    return run, _varied_players()
+
+
+@benchmark("Player.best_value", ops=128)
+def _best_value():
+    def run(players):
+        for player in players:
+            player.best_value()
+    return run, _varied_players()
+
+
+def _table(seats=7):
+    game = Game(num_slots=seats, deck=Deck(num_decks=5, rng=_rng()))
+    for seat in range(seats):
+        game.sit_down(seat)
+    return game
+
+
+@benchmark("Game.new_round", ops=20)
+def _new_round():
+    return _repeat(Game.new_round, 20), _table()
+
+
+def _dealer_ready(split):
+    """A one-seat round waiting for the dealer, optionally with a split hand"""
+    game = _table(seats=1)
+    while True:
+        game.new_round()
+        if game.in_round and game.dealer.hand.best_value() != 21:
+            break
+    if split:
+        # Swap in a pair and split it through the game so the ledger holds
+        # a wager per hand; the shoe deals the second card of each
+        hand = game.slots[0].hand
+        hand.clear()
+        hand.extend((Card("Hearts", "8"), Card("Clubs", "8")))
+        game.player_split(0)
+    return game
+
+
+@benchmark("Game.dealer_play")
+def _dealer_play():
+    return Game.dealer_play, _dealer_ready(split=False)
+
+
+@benchmark("Game.dealer_play[split]")
+def _dealer_play_split():
+    return Game.dealer_play, _dealer_ready(split=True)
+
+
+@benchmark("Simulator.play_round", ops=100)
+def _full_round():
+    def run(simulator):
+        result = SimulationResult()
+        for _ in range(100):
+            simulator.play_round(result)
+    return run, Simulator(basic_strategy_policy, game=_table(seats=1))
+
+
+def _gui_benchmarks():
+    """Register the tkinter benchmarks if a (virtual) display is available"""
+    try:
+        from GUI.DeckGUI import DeckGUI
+        from GUI.GameGUI import GameGUI
+        gui = GameGUI(_table())
+    except Exception as exc:  # no tkinter, or no display to open
+        return f"GUI benchmarks skipped: {exc}"
+    gui.withdraw()
+    gui.player_seat = 0
+    gui.game.new_round()
+    windows = []
+
+    def render(widget):
+        widget.update_ui()
+        widget.update_idletasks()
+
+    @benchmark("GameGUI.update_ui")
+    def _update_ui():
+        return render, gui
+
+    @benchmark("DeckGUI._build_ui")
+    def _deck_ui():
+        while windows:
+            windows.pop().destroy()
+        window = DeckGUI(gui, gui.game.deck)
+        window.withdraw()
+        for child in window.winfo_children():
+            child.destroy()
+        windows.append(window)
+
+        def build(window):
+            window._build_ui()
+            window.update_idletasks()
+        return build, window
+    return None
+
+
+def _start_virtual_display():
+    if os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    display = ":97"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    return process
+
+
+def run(names=None, runs=10):
+    """Best time per operation of each benchmark over ``runs`` interleaved
+    passes, so a burst of load on the machine cannot cover all of one
+    benchmark's samples"""
+    results = {}
+    for _ in range(runs):
+        for name, ops, setup in BENCHMARKS:
+            if names and name not in names:
+                continue
+            seconds = measure(setup, ops)
+            results[name] = min(seconds, results.get(name, seconds))
+    return results
+
+
+def slower(results, baselines, threshold):
+    """Names of the results more than ``threshold`` slower than their baseline"""
+    return [name for name, seconds in results.items()
+            if baselines.get(name) and seconds / baselines[name] - 1 > threshold]
+
+
+def remeasure(results, names, times, runs=10):
+    """Run ``names`` ``times`` more and keep the median of each one's
+    passes, so a single slow (or lucky) pass does not decide"""
+    if not names or not times:
+        return results
+    print(f"Measuring {', '.join(names)} {times} more time(s)")
+    passes = {name: [results[name]] for name in names}
+    for _ in range(times):
+        for name, seconds in run(names, runs).items():
+            passes[name].append(seconds)
+    results = dict(results)
+    for name, seconds in passes.items():
+        results[name] = statistics.median(seconds)
+    return results
+
+
+def compare(results, baselines, threshold):
+    """Print a table and return the names that regressed"""
+    regressions = []
+    print(f"{'benchmark':<28}{'time':>12}{'baseline':>12}{'change':>10}")
+    for name, seconds in results.items():
+        baseline = baselines.get(name)
+        line = f"{name:<28}{_format(seconds):>12}"
+        if baseline:
+            change = seconds / baseline - 1
+            line += f"{_format(baseline):>12}{change:>+10.1%}"
+            if change > threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def _format(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} us"
+    return f"{seconds * 1e3:.2f} ms"
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Engine and GUI benchmarks")
+    parser.add_argument("names", nargs="*", help="only run these benchmarks")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--runs", type=int, default=10,
+                        help="passes over the suite, keeping each benchmark's best")
+    parser.add_argument("--confirm", type=int, default=2,
+                        help="extra passes for suspected regressions and new baselines "
+                             "(the median is kept)")
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--no-gui", action="store_true")
+    args = parser.parse_args()
+
+    display = None
+    if not args.no_gui:
+        display = _start_virtual_display()
+        skipped = _gui_benchmarks()
+        if skipped:
+            print(skipped)
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+    try:
+        results = run(args.names, args.runs)
+        # New baselines are medians too; a check only re-runs the suspects
+        suspects = (list(results) if args.update_baselines
+                    else slower(results, baselines, args.threshold))
+        results = remeasure(results, suspects, args.confirm, args.runs)
+    finally:
+        if display is not None:
+            display.terminate()
+
+    regressions = compare(results, baselines, args.threshold)
+
+    if args.update_baselines:
+        baselines.update((name, float(f"{seconds:.4g}")) for name, seconds in results.items())
+        with open(BASELINES, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines written to {BASELINES}")
+    elif regressions:
+        raise SystemExit(f"{len(regressions)} benchmark(s) regressed")
+
+
+if __name__ == "__main__":
+    main()
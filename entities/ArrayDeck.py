@@ -0,0 +1,123 @@
+from collections import deque
+
+import numpy as np
+
+from entities.Card import Card
+from entities.Deck import MIN_CARDS, composition_from_ranks, shoe_counts
+from entities.RandomSource import as_random_source
+
+# The shoe only ever holds indexes into the interned cards (code == card.index)
+CARDS = Card.ALL
+
+
+class ArrayDeck:
+    """Shoe stored as a compact int8 array of card codes (suit * 13 + rank).
+
+    Drop-in replacement for entities.Deck: ``deal_card``, ``__len__`` and
+    ``cards`` behave the same, but building and shuffling work on a single
+    preallocated NumPy array and dealt cards are shared flyweights. Any
+    entities.RandomSource works; a NumPy Generator shuffles in place.
+    ``penetration`` places the cut card as in Deck; the whole shoe is always
+    shuffled up front, so lazy and continuous shuffling raise ValueError.
+    """
+
+    continuous = False
+    suits = list(Card.SUITS)
+    ranks = list(Card.RANKS)
+
+    def __init__(self, num_decks=1, seed=None, rng=None, lazy=False, penetration=None,
+                 continuous=False):
+        if lazy or continuous:
+            raise ValueError("ArrayDeck only shuffles whole shoes, use entities.Deck "
+                             "for lazy or continuous shuffling")
+        self.num_decks = num_decks
+        if penetration is None:
+            self.cut_card = MIN_CARDS
+        else:
+            self.cut_card = max(1, round(52 * num_decks * (1 - penetration)))
+        self.rng = as_random_source(rng if rng is not None else np.random.default_rng(seed))
+        self._generator = getattr(self.rng, "generator", None)  # NumPy fast path
+        self._orders = deque()  # pre-drawn shoe permutations, see prepare_shoes
+        self._fresh = np.tile(np.arange(len(CARDS), dtype=np.int8), num_decks)
+        self._shoe = np.empty_like(self._fresh)
+        self._top = 0  # cards at index < _top are still in the shoe
+        self.build()
+
+    def build(self):
+        self._top = len(self._shoe)
+        self.remaining = [4 * self.num_decks] * len(Card.RANKS)  # per rank index
+        self.running_count = 0  # Hi-Lo count of the cards dealt since build
+        if self._orders:
+            np.take(self._fresh, self._orders.popleft(), out=self._shoe)
+        else:
+            self._shoe[:] = self._fresh
+            self.shuffle()
+
+    def prepare_shoes(self, count):
+        """Draw the orders of the next ``count`` shoes in one bulk call to the
+        random source"""
+        self._orders.extend(self.rng.permutations(len(self._fresh), count))
+
+    def shuffle(self):
+        if self._generator is not None:
+            self._generator.shuffle(self._shoe[:self._top])
+        else:
+            self.rng.shuffle(self._shoe[:self._top])
+
+    def deal_card(self):
+        if not self._top:
+            self.build()  # reshuffle new deck automatically
+        self._top -= 1
+        card = CARDS[self._shoe.item(self._top)]
+        self.remaining[card.rank_index] -= 1
+        self.running_count += card.hilo
+        return card
+
+    def copy(self):
+        """Independent shoe in the same order, sharing the Generator"""
+        deck = ArrayDeck.__new__(ArrayDeck)
+        deck.num_decks = self.num_decks
+        deck.cut_card = self.cut_card
+        deck.rng = self.rng
+        deck._generator = self._generator
+        deck._orders = deque(self._orders)
+        deck._fresh = self._fresh  # never written to
+        deck._shoe = self._shoe.copy()
+        deck._top = self._top
+        deck.remaining = list(self.remaining)
+        deck.running_count = self.running_count
+        return deck
+
+    def restore(self, cards):
+        """Load a saved shoe order (last card is dealt next)"""
+        self._top = len(cards)
+        self._shoe[:self._top] = [card.index for card in cards]
+        self.remaining, self.running_count = shoe_counts(cards)
+
+    def needs_shuffle(self):
+        return self._top < self.cut_card
+
+    @property
+    def true_count(self):
+        """Running count per deck left in the shoe"""
+        return self.running_count * 52 / self._top if self._top else 0.0
+
+    def composition(self):
+        """Remaining cards by point rank (ace, 2-9, tens), as strategy uses"""
+        return composition_from_ranks(self.remaining)
+
+    @property
+    def cards(self):
+        """Remaining cards, in the same order as Deck.cards (last is dealt next)"""
+        return [CARDS[code] for code in self._shoe[:self._top].tolist()]
+
+    def rank_indexes(self):
+        """Rank index (0 = "2" ... 12 = "A") of every remaining card, as an array"""
+        return self._shoe[:self._top] % 13
+
+    def suit_indexes(self):
+        """Index into Card.SUITS of every remaining card, as an array"""
+        return self._shoe[:self._top] // 13
+
+    def __len__(self):
+        return self._top
@@ -1,23 +1,75 @@
 class Card:
+    """Immutable playing card.
+
+    There is exactly one instance per (suit, rank): ``Card(suit, rank)``
+    returns the pre-built shared card, so shoes of any size reuse the same
+    52 objects.
+    """
     SUIT_SYMBOLS = {
         "Hearts": "♥",
         "Diamonds": "♦",
         "Clubs": "♣",
         "Spades": "♠"
     }
+    SUITS = tuple(SUIT_SYMBOLS)
+    RANKS = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+    VALUES = {
+        "2": 2, "3": 3, "4": 4, "5": 5, "6": 6,
+        "7": 7, "8": 8, "9": 9, "10": 10,
+        "J": 10, "Q": 10, "K": 10, "A": 11
+    }
+
+    # Hi-Lo count tag: +1 for 2-6, 0 for 7-9, -1 for tens and aces
+    HILO = {
+        "2": 1, "3": 1, "4": 1, "5": 1, "6": 1,
+        "7": 0, "8": 0, "9": 0, "10": -1,
+        "J": -1, "Q": -1, "K": -1, "A": -1
+    }
+
+    __slots__ = ("suit", "rank", "value", "is_ace", "rank_index", "hilo", "index", "_str")
+    _interned = {}
+
+    def __new__(cls, suit, rank):
+        try:
+            return cls._interned[suit, rank]
+        except KeyError:
+            pass
+        if suit not in cls.SUIT_SYMBOLS or rank not in cls.VALUES:
+            raise ValueError(f"Unknown card: {rank} of {suit}")
+        card = super().__new__(cls)
+        init = super(Card, card).__setattr__
+        init("suit", suit)
+        init("rank", rank)
+        init("value", cls.VALUES[rank])
+        init("is_ace", rank == "A")
+        init("rank_index", cls.RANKS.index(rank))
+        init("hilo", cls.HILO[rank])
+        init("index", cls.SUITS.index(suit) * len(cls.RANKS) + cls.RANKS.index(rank))
+        init("_str", f"{rank}{cls.SUIT_SYMBOLS[suit]}")
+        cls._interned[suit, rank] = card
+        return card
 
-    def __init__(self, suit, rank):
-        self.suit = suit
-        self.rank = rank
-        values = {
-            "2": 2, "3": 3, "4": 4, "5": 5, "6": 6,
-            "7": 7, "8": 8, "9": 9, "10": 10,
-            "J": 10, "Q": 10, "K": 10, "A": 11
-        }
-        self.value = values[rank]
+    def __setattr__(self, name, value):
+        raise AttributeError("Card objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Card objects are immutable")
+
+    def __reduce__(self):
+        return Card, (self.suit, self.rank)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __str__(self):
-        return f"{self.rank}{Card.SUIT_SYMBOLS[self.suit]}"
+        return self._str
 
     def __repr__(self):
-        return str(self)
\ No newline at end of file
+        return self._str
+
+
+# All 52 cards in suit-major order; Card.ALL[card.index] is card
+Card.ALL = tuple(Card(suit, rank) for suit in Card.SUITS for rank in Card.RANKS)
@@ -1,30 +1,129 @@
+from collections import deque
+
 from entities.Card import Card
-import random
+from entities.RandomSource import as_random_source
+
+# Without a cut card the shoe is rebuilt once fewer cards than this remain
+MIN_CARDS = 15
+
 
 class Deck:
-    suits = ["Hearts", "Diamonds", "Clubs", "Spades"]
-    ranks = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+    """Shoe of ``num_decks`` decks.
+
+    ``lazy`` skips the up-front shuffle and instead swaps a random remaining
+    card to the top on every draw (Fisher-Yates, one step per card), so the
+    part of the shoe behind the cut card is never shuffled. ``penetration``
+    places the cut card after that fraction of the shoe. ``continuous``
+    models a continuous shuffling machine: Game returns each round's cards
+    to the shoe, which implies lazy dealing and never needs a reshuffle.
 
-    def __init__(self, num_decks=1):
+    ``rng`` is any random source accepted by entities.RandomSource, e.g. a
+    seeded random.Random or NumPy Generator; the default is the global
+    ``random`` module.
+    """
+    suits = list(Card.SUITS)
+    ranks = list(Card.RANKS)
+
+    def __init__(self, num_decks=1, rng=None, lazy=False, penetration=None, continuous=False):
         self.num_decks = num_decks
+        self.rng = as_random_source(rng)
+        self._orders = deque()  # pre-drawn shoe permutations, see prepare_shoes
+        self.lazy = lazy or continuous
+        self.continuous = continuous
+        if penetration is None:
+            self.cut_card = MIN_CARDS
+        else:
+            self.cut_card = max(1, round(52 * num_decks * (1 - penetration)))
         self.build()
 
     def build(self):
-        self.cards = [
-            Card(suit, rank)
-            for _ in range(self.num_decks)
-            for suit in self.suits
-            for rank in self.ranks
-        ]
-        self.shuffle()
+        self.cards = list(Card.ALL) * self.num_decks  # shared, immutable cards
+        self.remaining = [4 * self.num_decks] * len(self.ranks)  # per rank index
+        self.running_count = 0  # Hi-Lo count of the cards dealt since build
+        if not self.lazy:
+            self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        if self._orders and len(self._orders[0]) == len(self.cards):
+            cards = self.cards
+            self.cards = [cards[i] for i in self._orders.popleft()]
+        else:
+            self.rng.shuffle(self.cards)
+
+    def prepare_shoes(self, count):
+        """Draw the permutations for the next ``count`` full-shoe shuffles in
+        one bulk call to the random source"""
+        self._orders.extend(self.rng.permutations(52 * self.num_decks, count))
 
     def deal_card(self):
         if not self.cards:
             self.build()  # reshuffle new deck automatically
-        return self.cards.pop()
+        if self.lazy:
+            # One Fisher-Yates step: swap a random remaining card to the top
+            cards = self.cards
+            j = self.rng.randbelow(len(cards))
+            cards[j], cards[-1] = cards[-1], cards[j]
+        card = self.cards.pop()
+        self.remaining[card.rank_index] -= 1
+        self.running_count += card.hilo
+        return card
+
+    def copy(self):
+        """Independent shoe in the same order. The random source is shared,
+        so a copy only draws from it once it reshuffles or deals lazily."""
+        deck = Deck.__new__(Deck)
+        deck.num_decks = self.num_decks
+        deck.rng = self.rng
+        deck._orders = deque(self._orders)
+        deck.lazy = self.lazy
+        deck.continuous = self.continuous
+        deck.cut_card = self.cut_card
+        deck.cards = list(self.cards)
+        deck.remaining = list(self.remaining)
+        deck.running_count = self.running_count
+        return deck
+
+    def restore(self, cards):
+        """Load a saved shoe order (last card is dealt next) and rederive the
+        counts from it"""
+        self.cards = list(cards)
+        self.remaining, self.running_count = shoe_counts(self.cards)
+
+    def needs_shuffle(self):
+        """Whether the cut card has come out (never for a continuous shuffler)"""
+        return not self.continuous and len(self.cards) < self.cut_card
+
+    def return_cards(self, cards):
+        """Put used cards back into a continuous shuffler"""
+        for card in cards:
+            self.cards.append(card)
+            self.remaining[card.rank_index] += 1
+            self.running_count -= card.hilo
+
+    @property
+    def true_count(self):
+        """Running count per deck left in the shoe"""
+        return self.running_count * 52 / len(self.cards) if self.cards else 0.0
+
+    def composition(self):
+        """Remaining cards by point rank (ace, 2-9, tens), as strategy uses"""
+        return composition_from_ranks(self.remaining)
 
     def __len__(self):
         return len(self.cards)
+
+
+def shoe_counts(cards):
+    """Per-rank counts and Hi-Lo running count of a shoe holding ``cards``;
+    a full shoe counts to zero, so the running count is minus what is left"""
+    remaining = [0] * len(Card.RANKS)
+    running_count = 0
+    for card in cards:
+        remaining[card.rank_index] += 1
+        running_count -= card.hilo
+    return remaining, running_count
+
+
+def composition_from_ranks(remaining):
+    """Fold per-rank counts ("2".."A") into point-rank counts (A, 2-9, ten)"""
+    return (remaining[12],) + tuple(remaining[:8]) + (sum(remaining[8:12]),)
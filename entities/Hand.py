@@ -0,0 +1,70 @@
+class Hand(list):
+    """A list of cards that keeps its blackjack total up to date.
+
+    ``hard`` counts every ace as 1 and ``aces`` counts the aces, so all value
+    queries are O(1). Only append/extend/pop/clear keep them in sync; do not
+    assign into the list directly.
+    """
+    __slots__ = ("hard", "aces", "doubled")
+
+    def __init__(self, cards=(), doubled=False):
+        super().__init__()
+        self.hard = 0
+        self.aces = 0
+        self.doubled = doubled  # stake doubled on this hand
+        self.extend(cards)
+
+    def append(self, card):
+        super().append(card)
+        if card.is_ace:
+            self.aces += 1
+            self.hard += 1
+        else:
+            self.hard += card.value
+
+    def extend(self, cards):
+        for card in cards:
+            self.append(card)
+
+    def pop(self, index=-1):
+        card = super().pop(index)
+        if card.is_ace:
+            self.aces -= 1
+            self.hard -= 1
+        else:
+            self.hard -= card.value
+        return card
+
+    def clear(self):
+        super().clear()
+        self.hard = 0
+        self.aces = 0
+
+    def copy(self):
+        hand = Hand.__new__(Hand)  # skip the per-card bookkeeping, totals are known
+        list.extend(hand, self)
+        hand.hard = self.hard
+        hand.aces = self.aces
+        hand.doubled = self.doubled
+        return hand
+
+    def __reduce__(self):
+        return Hand, (list(self), self.doubled)
+
+    def is_soft(self):
+        """True if an ace is currently counted as 11"""
+        return self.aces > 0 and self.hard <= 11
+
+    def best_value(self):
+        if self.aces and self.hard <= 11:
+            return self.hard + 10
+        return self.hard
+
+    def possible_values(self):
+        """Non-busted totals in ascending order, or the busted total"""
+        if self.aces and self.hard <= 11:
+            return [self.hard, self.hard + 10]
+        return [self.hard]
+
+    def is_busted(self):
+        return self.hard > 21
@@ -0,0 +1,45 @@
+class Ledger:
+    """Bankroll and the wagers a player has on the table this round"""
+
+    def __init__(self, bankroll=0.0, bet=1.0):
+        self.bankroll = bankroll
+        self.bet = bet  # stake placed on the main hand at the start of a round
+        self.wagers = []  # stake per hand, same order as Player.hands
+
+    def open_round(self):
+        """Place the base bet for a new round"""
+        self.wagers = [self.bet]
+        self.bankroll -= self.bet
+
+    def double(self, hand_index):
+        self.bankroll -= self.wagers[hand_index]
+        self.wagers[hand_index] *= 2
+
+    def split(self, hand_index=0):
+        """Match the wager of the hand being split on the new hand after it"""
+        wager = self.wagers[hand_index]
+        self.bankroll -= wager
+        self.wagers.insert(hand_index + 1, wager)
+
+    def settle(self, payouts):
+        """Pay out every hand and return the round's net win.
+
+        ``payouts`` holds the units won per unit staked for each hand
+        (e.g. 1.5 for a blackjack, -1 for a loss).
+        """
+        net = 0.0
+        for wager, payout in zip(self.wagers, payouts):
+            self.bankroll += wager * (1 + payout)
+            net += wager * payout
+        self.wagers = []
+        return net
+
+    def copy(self):
+        ledger = Ledger(self.bankroll, self.bet)
+        ledger.wagers = list(self.wagers)
+        return ledger
+
+    @property
+    def at_risk(self):
+        """Total amount currently wagered"""
+        return sum(self.wagers)
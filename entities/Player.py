@@ -1,47 +1,71 @@
-from entities.Card import Card
+from entities.Hand import Hand
+from entities.Ledger import Ledger
 
 class Player:
-    def __init__(self, name):
+    def __init__(self, name, bankroll=0.0, max_hands=2, double_after_split=True, surrender=False):
         self.name = name
-        self.hand = []
+        self.ledger = Ledger(bankroll)
+        self.hands = [Hand()]  # main hand, then the split hands in table order
         self.finished = False  # whether the player is done (stood or busted)
-        self.split_hand = None  # second hand if player splits
-        self.doubled = False  # whether player has doubled down
-        self.active_hand = 0  # 0 for main hand, 1 for split hand
+        self.active_hand = 0  # index into hands of the hand being played
+        self.surrendered = False
+        # Table rules this seat plays under, see game.Rules
+        self.max_hands = max_hands
+        self.double_after_split = double_after_split
+        self.surrender = surrender
+
+    @property
+    def hand(self):
+        return self.hands[0]
+
+    @property
+    def split_hand(self):
+        """Second hand if player splits, otherwise None"""
+        return self.hands[1] if len(self.hands) > 1 else None
+
+    @property
+    def doubled(self):
+        """Whether player has doubled down on the active hand"""
+        return self.hands[self.active_hand].doubled
+
+    @doubled.setter
+    def doubled(self, value):
+        self.hands[self.active_hand].doubled = value
+
+    def copy(self):
+        """Independent copy; only the immutable cards are shared"""
+        player = Player.__new__(Player)
+        player.name = self.name
+        player.ledger = self.ledger.copy()
+        player.hands = [hand.copy() for hand in self.hands]
+        player.finished = self.finished
+        player.active_hand = self.active_hand
+        player.surrendered = self.surrendered
+        player.max_hands = self.max_hands
+        player.double_after_split = self.double_after_split
+        player.surrender = self.surrender
+        return player
 
     def reset_hand(self):
-        self.hand = []
+        self.hands = [Hand()]
         self.finished = False
-        self.split_hand = None
-        self.doubled = False
         self.active_hand = 0
+        self.surrendered = False
 
     def add_card(self, card):
         self.hand.append(card)
 
     def possible_values(self):
-        total = sum(card.value for card in self.hand)
-        aces = sum(1 for c in self.hand if c.rank == "A")
-        values = {total}
-        for _ in range(aces):
-            total -= 10
-            values.add(total)
-        # Filter busted values if at least one non-busted exists
-        non_bust = [v for v in values if v <= 21]
-        if non_bust:
-            return sorted(non_bust)
-        return sorted(values)  # if all busted, return the busted values
+        return self.hand.possible_values()
 
     def best_value(self):
-        values = self.possible_values()
-        under_or_equal = [v for v in values if v <= 21]
-        return max(under_or_equal) if under_or_equal else min(values)
+        return self.hand.best_value()
 
     def calculate_value(self):
-        return self.best_value()
+        return self.hand.best_value()
 
     def is_busted(self):
-        return all(v > 21 for v in self.possible_values())
+        return self.hand.is_busted()
 
     def show_hand_str(self, hide_first=False):
         if hide_first and len(self.hand) > 0:
@@ -49,44 +73,45 @@ class Player:
         return ", ".join(str(c) for c in self.hand)
 
     def can_split(self):
-        """Check if player can split (2 cards with same value)"""
-        return (len(self.hand) == 2 and
-                self.split_hand is None and
-                self.hand[0].value == self.hand[1].value)
+        """Check if player can split (2 cards with same value, room for another hand)"""
+        current_hand = self.hands[self.active_hand]
+        return (len(current_hand) == 2 and
+                len(self.hands) < self.max_hands and
+                current_hand[0].value == current_hand[1].value)
 
     def can_double(self):
         """Check if player can double down (exactly 2 cards in current hand)"""
-        current_hand = self.get_current_hand()
-        return len(current_hand) == 2 and not self.doubled
+        current_hand = self.hands[self.active_hand]
+        return (len(current_hand) == 2 and not current_hand.doubled and
+                (self.double_after_split or len(self.hands) == 1))
+
+    def can_surrender(self):
+        """Surrender is only offered on the first two cards"""
+        return self.surrender and len(self.hands) == 1 and len(self.hand) == 2
 
     def get_current_hand(self):
         """Get the currently active hand"""
-        if self.active_hand == 1 and self.split_hand is not None:
-            return self.split_hand
-        return self.hand
+        return self.hands[self.active_hand]
 
     def get_current_value(self):
         """Get value of current active hand"""
-        current = self.get_current_hand()
-        total = sum(card.value for card in current)
-        aces = sum(1 for c in current if c.rank == "A")
-        values = {total}
-        for _ in range(aces):
-            total -= 10
-            values.add(total)
-        non_bust = [v for v in values if v <= 21]
-        if non_bust:
-            return max(non_bust)
-        return min(values)
+        return self.get_current_hand().best_value()
 
     def is_current_hand_busted(self):
         """Check if current active hand is busted"""
-        current = self.get_current_hand()
-        total = sum(card.value for card in current)
-        aces = sum(1 for c in current if c.rank == "A")
-        values = {total}
-        for _ in range(aces):
-            total -= 10
-            values.add(total)
-        return all(v > 21 for v in values)
+        return self.get_current_hand().is_busted()
+
+    def split(self):
+        """Move the second card of the active hand into a new hand right after it"""
+        self.hands.insert(self.active_hand + 1, Hand([self.hands[self.active_hand].pop()]))
+
+    def next_hand(self):
+        """Move on to the next split hand; False if the active hand was the last"""
+        if self.active_hand + 1 < len(self.hands):
+            self.active_hand += 1
+            return True
+        return False
 
+    def has_natural(self):
+        """Blackjack on the initial two cards (split hands never count)"""
+        return len(self.hands) == 1 and len(self.hand) == 2 and self.hand.best_value() == 21
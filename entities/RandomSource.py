@@ -0,0 +1,112 @@
+import random
+
+
+class RandomSource:
+    """Random numbers for shuffling and dealing, backed by random.Random.
+
+    Every source offers ``randbelow(n)``, an in-place ``shuffle(items)`` and
+    ``permutations(n, count)``, the bulk path that draws the order of many
+    shoes at once.
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+
+    def randbelow(self, n):
+        return self.rng.randrange(n)
+
+    def shuffle(self, items):
+        self.rng.shuffle(items)
+
+    def permutations(self, n, count):
+        return [self.rng.sample(range(n), n) for _ in range(count)]
+
+
+class NumpyRandomSource:
+    """Source backed by a NumPy Generator (PCG64 by default)"""
+
+    BLOCK = 4096  # uniforms fetched per refill for randbelow
+
+    def __init__(self, generator=None, seed=None):
+        import numpy as np
+
+        self._np = np
+        self.generator = generator if generator is not None else np.random.default_rng(seed)
+        self._uniforms = []
+
+    def randbelow(self, n):
+        if not self._uniforms:
+            self._uniforms = self.generator.random(self.BLOCK).tolist()
+        return int(self._uniforms.pop() * n)
+
+    def shuffle(self, items):
+        order = self.generator.permutation(len(items)).tolist()
+        items[:] = [items[i] for i in order]
+
+    def permutations(self, n, count):
+        """``count`` x ``n`` array, one permutation of range(n) per row"""
+        np = self._np
+        return self.generator.permuted(np.tile(np.arange(n), (count, 1)), axis=1)
+
+
+class RecordingRandomSource:
+    """Wraps another source and records every number it hands out.
+
+    Shuffles are done as Fisher-Yates on top of ``randbelow``, so the record
+    alone is enough for ReplayRandomSource to reproduce every shoe.
+    """
+
+    def __init__(self, source=None):
+        self.source = as_random_source(source)
+        self.record = []
+
+    def randbelow(self, n):
+        value = self.source.randbelow(n)
+        self.record.append(value)
+        return value
+
+    def shuffle(self, items):
+        _fisher_yates(items, self.randbelow)
+
+    def permutations(self, n, count):
+        orders = []
+        for _ in range(count):
+            order = list(range(n))
+            _fisher_yates(order, self.randbelow)
+            orders.append(order)
+        return orders
+
+
+class ReplayRandomSource(RecordingRandomSource):
+    """Plays back the numbers recorded by a RecordingRandomSource"""
+
+    def __init__(self, record):
+        self.record = list(record)
+        self._position = 0
+
+    def randbelow(self, n):
+        if self._position >= len(self.record):
+            raise ValueError("recorded random stream exhausted")
+        value = self.record[self._position]
+        if value >= n:
+            raise ValueError(f"recorded value {value} does not fit randbelow({n})")
+        self._position += 1
+        return value
+
+
+def as_random_source(rng):
+    """Wrap ``rng`` (None, the random module, random.Random, a NumPy
+    Generator or an existing source) in the source interface"""
+    if rng is None:
+        return RandomSource(random)  # the global generator, as random.shuffle used
+    if hasattr(rng, "randbelow") and hasattr(rng, "permutations"):
+        return rng
+    if hasattr(rng, "bit_generator"):
+        return NumpyRandomSource(rng)
+    return RandomSource(rng)
+
+
+def _fisher_yates(items, randbelow):
+    for i in range(len(items) - 1, 0, -1):
+        j = randbelow(i + 1)
+        items[i], items[j] = items[j], items[i]
@@ -1,230 +1,318 @@
 from entities.Deck import Deck
 from entities.Player import Player
+from game.Outcome import (
+    CONTINUE, IGNORED, INVALID, NEXT_HAND, PAYOUTS, SEAT_DONE, SPLIT,
+    ActionResult, Outcome, Transition,
+)
+from game.Rules import Rules
 
 class Game:
-    def __init__(self, num_slots=7):
-        self.deck = Deck(num_decks=5)
+    def __init__(self, num_slots=7, deck=None, event_log=None, rules=None):
+        self.rules = rules or Rules()  # a given deck keeps its own number of decks
+        self.deck = deck if deck is not None else Deck(num_decks=self.rules.num_decks)
+        self.event_log = event_log  # optional audit.EventLog.EventLog or simulation.HandStore
+        self.round_number = 0
         self.dealer = Player("Dealer")
         self.slots = [None] * num_slots  # seats around the table
         self.in_round = False
+        self.turn = None  # seat index whose turn it is to act
+        self.results = {}  # seat index -> ActionResult once the round is settled
         self.dealer_has_blackjack = False
         self.player_has_blackjack = False
 
+    def fork(self):
+        """Independent copy of the table for what-if play from a live
+        position. Cards are shared flyweights and the shoe shares its random
+        source; the copy has no event log and no game.Metrics wrappers."""
+        game = Game.__new__(Game)
+        game.rules = self.rules
+        game.deck = self.deck.copy()
+        game.event_log = None
+        game.round_number = self.round_number
+        game.dealer = self.dealer.copy()
+        game.slots = [player.copy() if player else None for player in self.slots]
+        game.in_round = self.in_round
+        game.turn = self.turn
+        game.results = dict(self.results)  # ActionResults are immutable
+        game.dealer_has_blackjack = self.dealer_has_blackjack
+        game.player_has_blackjack = self.player_has_blackjack
+        return game
+
     def sit_down(self, seat_index, name="You"):
         """Put a player into a seat if it is empty."""
         if self.slots[seat_index] is None:
-            self.slots[seat_index] = Player(name)
+            rules = self.rules
+            self.slots[seat_index] = Player(name, max_hands=rules.max_hands,
+                                            double_after_split=rules.double_after_split,
+                                            surrender=rules.surrender)
             return True
         return False
 
+    def stand_up(self, seat_index):
+        """Free a seat between rounds."""
+        if self.in_round or self.slots[seat_index] is None:
+            return False
+        self.slots[seat_index] = None
+        self.results.pop(seat_index, None)
+        return True
+
+    def place_bet(self, seat_index, amount):
+        """Set the stake a seated player puts on each new round."""
+        player = self.slots[seat_index]
+        if self.in_round or not player or amount <= 0:
+            return False
+        player.ledger.bet = amount
+        return True
+
     def new_round(self):
+        self.round_number += 1
+        log = self.event_log
+        if self.deck.continuous:
+            self.deck.return_cards(self._cards_on_table())
+        elif self.deck.needs_shuffle():
+            self.deck.build()
+            if log is not None:
+                log.shuffle(self.round_number, self.deck.num_decks)
+
         self.dealer.reset_hand()
         self.dealer_has_blackjack = False
         self.player_has_blackjack = False
+        self.results = {}
         for player in self.slots:
             if player:
                 player.reset_hand()
+                player.ledger.open_round()
         self.in_round = True
-
-        if len(self.deck) < 15:
-            self.deck.build()
+        if log is not None:
+            log.round(self.round_number, sum(1 for player in self.slots if player))
 
         for _ in range(2):
-            for player in self.slots:
+            for seat_index, player in enumerate(self.slots):
                 if player:
-                    player.add_card(self.deck.deal_card())
-            self.dealer.add_card(self.deck.deal_card())
+                    self._deal(player.hand, seat_index)
+            self._deal(self.dealer.hand, -1)
 
         return self.check_blackjack()
 
-    def check_blackjack(self):
-        """Check only for player blackjack at the start of the round.
-        Dealer blackjack is checked only after player finishes their turn."""
+    def _deal(self, hand, seat_index, hand_index=0):
+        """Deal the next card into ``hand`` (seat -1 is the dealer)"""
+        card = self.deck.deal_card()
+        hand.append(card)
+        if self.event_log is not None:
+            self.event_log.deal(self.round_number, seat_index, hand_index, card)
+
+    def _log_action(self, seat_index, player, action):
+        if self.event_log is not None:
+            self.event_log.action(self.round_number, seat_index, player.active_hand, action)
+
+    def _cards_on_table(self):
+        """Every card dealt in the current (or last) round"""
+        cards = list(self.dealer.hand)
         for player in self.slots:
-            if not player:
-                continue
-            pval = player.calculate_value()
-            # Only check if player has blackjack, not dealer
-            if pval == 21:
-                self.in_round = False
+            if player:
+                for hand in player.hands:
+                    cards.extend(hand)
+        return cards
+
+    def check_blackjack(self):
+        """Check only for player blackjacks at the start of the round.
+        Dealer blackjack is checked only after the players finish their turns.
+        Seats with a blackjack are done; if no seat is left to act the round
+        is settled right away and the first blackjack seat's result returned."""
+        first_blackjack = None
+        for seat_index, player in enumerate(self.slots):
+            if player and player.has_natural():
+                player.finished = True
                 self.player_has_blackjack = True
-                # Check dealer blackjack only if player also has it
-                dval = self.dealer.calculate_value()
-                if dval == 21:
-                    self.dealer_has_blackjack = True
-                    return "Push: both have Blackjack!"
-                return "Blackjack! You win!"
+                if first_blackjack is None:
+                    first_blackjack = seat_index
+
+        self.turn = self._next_turn(-1)
+        if self.turn is None:
+            return self.dealer_play(first_blackjack)
+        return CONTINUE
+
+    def _next_turn(self, after_seat):
+        """First seat after ``after_seat`` that still has to act, or None"""
+        for seat_index in range(after_seat + 1, len(self.slots)):
+            player = self.slots[seat_index]
+            if player and not player.finished:
+                return seat_index
         return None
 
-    def player_hit(self, seat_index):
-        player = self.slots[seat_index]
-        if not self.in_round or not player:
+    def _acting_player(self, seat_index):
+        """The player in ``seat_index`` if it is their turn in a live round"""
+        if not self.in_round or seat_index != self.turn:
             return None
+        return self.slots[seat_index]
 
+    def _finish_seat(self, seat_index):
+        """Seat is done acting: pass the turn on, or let the dealer play"""
+        player = self.slots[seat_index]
+        player.finished = True
+        self.turn = self._next_turn(seat_index)
+        if self.turn is None:
+            return self.dealer_play(seat_index)
+        return SEAT_DONE
+
+    def player_hit(self, seat_index):
+        player = self._acting_player(seat_index)
+        if not player:
+            return IGNORED
+
+        self._log_action(seat_index, player, "hit")
+        return self._hit(seat_index, player)
+
+    def _hit(self, seat_index, player):
         # Add card to current active hand
         current_hand = player.get_current_hand()
-        current_hand.append(self.deck.deal_card())
+        self._deal(current_hand, seat_index, player.active_hand)
 
-        if player.is_current_hand_busted():
+        if current_hand.is_busted():
             # If split hand exists and we're on first hand, move to second hand
-            if player.split_hand is not None and player.active_hand == 0:
-                player.active_hand = 1
-                return "First hand busted! Playing split hand now."
-            elif player.split_hand is not None and player.active_hand == 1:
-                # Second split hand busted, but first hand might still win
-                player.finished = True
-                return self.dealer_play(seat_index)
-            else:
-                # Single hand busted
-                player.finished = True
-                self.in_round = False
-                return "You busted! Dealer wins."
+            if player.next_hand():
+                return NEXT_HAND
+            return self._finish_seat(seat_index)
 
         # If doubled, automatically stand after one card
         if player.doubled:
-            if player.split_hand is not None and player.active_hand == 0:
-                player.active_hand = 1
-                player.doubled = False  # Reset doubled flag for second hand
-                return "Double down complete! Playing split hand now."
-            else:
-                player.finished = True
-                return self.dealer_play(seat_index)
+            if player.next_hand():
+                return NEXT_HAND
+            return self._finish_seat(seat_index)
 
-        return None
+        return CONTINUE
 
     def player_double(self, seat_index):
         """Double down: double bet, get one card, automatically stand"""
-        player = self.slots[seat_index]
-        if not self.in_round or not player:
-            return None
+        player = self._acting_player(seat_index)
+        if not player:
+            return IGNORED
 
         if not player.can_double():
-            return "Cannot double! You need exactly 2 cards."
+            return INVALID
 
+        self._log_action(seat_index, player, "double")
         player.doubled = True
+        player.ledger.double(player.active_hand)
         # Deal one card and automatically stand
-        return self.player_hit(seat_index)
+        return self._hit(seat_index, player)
 
     def player_split(self, seat_index):
         """Split a pair into two separate hands"""
-        player = self.slots[seat_index]
-        if not self.in_round or not player:
-            return None
+        player = self._acting_player(seat_index)
+        if not player:
+            return IGNORED
 
         if not player.can_split():
-            return "Cannot split! You need two cards of the same value."
+            return INVALID
 
-        # Split the hand
-        player.split_hand = [player.hand.pop()]
+        self._log_action(seat_index, player, "split")
+        # Split the active hand; the new hand is played right after it
+        index = player.active_hand
+        player.split()
+        player.ledger.split(index)
 
         # Deal one card to each hand
-        player.hand.append(self.deck.deal_card())
-        player.split_hand.append(self.deck.deal_card())
+        self._deal(player.hands[index], seat_index, index)
+        self._deal(player.hands[index + 1], seat_index, index + 1)
 
-        return "Hand split! Playing first hand."
+        return SPLIT
 
-    def player_stand(self, seat_index):
-        if not self.in_round or not self.slots[seat_index]:
-            return None
+    def player_surrender(self, seat_index):
+        """Give up the first two cards for half the stake (the whole stake
+        if the dealer turns out to have blackjack)"""
+        player = self._acting_player(seat_index)
+        if not player:
+            return IGNORED
 
-        player = self.slots[seat_index]
+        if not player.can_surrender():
+            return INVALID
+
+        self._log_action(seat_index, player, "surrender")
+        player.surrendered = True
+        return self._finish_seat(seat_index)
 
+    def player_stand(self, seat_index):
+        player = self._acting_player(seat_index)
+        if not player:
+            return IGNORED
+
+        self._log_action(seat_index, player, "stand")
         # If we have a split hand and we're on the first hand, move to second hand
-        if player.split_hand is not None and player.active_hand == 0:
-            player.active_hand = 1
-            return "First hand complete! Playing split hand now."
+        if player.next_hand():
+            return NEXT_HAND
 
-        player.finished = True
-        return self.dealer_play(seat_index)
+        return self._finish_seat(seat_index)
 
-    def dealer_play(self, seat_index):
-        """Dealer plays after player stands. Check for dealer blackjack first."""
-        player = self.slots[seat_index]
-        dval = self.dealer.calculate_value()
-        pval = player.calculate_value()
+    def dealer_play(self, seat_index=None):
+        """Dealer plays once every seat is done, then all seats are settled.
+        Returns the result for ``seat_index``; all of them are kept in
+        ``results``."""
+        if not self.in_round:
+            return self.results.get(seat_index, IGNORED)
 
         # Check if dealer has blackjack (21 with 2 cards)
-        if dval == 21 and len(self.dealer.hand) == 2:
+        if self.dealer.calculate_value() == 21 and len(self.dealer.hand) == 2:
             self.dealer_has_blackjack = True
-            self.in_round = False
-            return "Dealer has Blackjack. You lose."
+        elif self._has_live_hand():
+            # Dealer draws to 17, hitting soft 17 if the rules say so
+            hits = self.rules.dealer_hits
+            hand = self.dealer.hand
+            while hits[hand.hard][hand.aces > 0]:
+                self._deal(hand, -1)
+
+        for index, player in enumerate(self.slots):
+            if player:
+                self.results[index] = self._settle(player)
+                if self.event_log is not None:
+                    self._log_settlement(index, player, self.results[index])
+        self.in_round = False
+        self.turn = None
+        return self.results.get(seat_index, IGNORED)
 
-        # Dealer draws cards until reaching 17 or more
-        while self.dealer.calculate_value() < 17:
-            self.dealer.add_card(self.deck.deal_card())
+    def _log_settlement(self, seat_index, player, result):
+        for hand_index, (hand, outcome) in enumerate(zip(player.hands, result.outcomes)):
+            net = PAYOUTS[outcome] * (2 if hand.doubled else 1)
+            self.event_log.settle(self.round_number, seat_index, hand_index, outcome, net)
 
-        if self.dealer.is_busted():
-            self.in_round = False
-            # Check split hand
-            if player.split_hand is not None:
-                return "Dealer busted! You win both hands!"
-            return "Dealer busted! You win!"
+    def _has_live_hand(self):
+        """Whether any seat still has a hand the dealer needs to beat"""
+        for player in self.slots:
+            if not player or player.surrendered or player.has_natural():
+                continue
+            for hand in player.hands:
+                if not hand.is_busted():
+                    return True
+        return False
 
-        dval = self.dealer.calculate_value()
-        self.in_round = False
+    def _settle(self, player):
+        """Outcome of every hand of one seat against the dealer's final hand"""
+        if player.surrendered:
+            outcome = Outcome.LOSE if self.dealer_has_blackjack else Outcome.SURRENDER
+            player.ledger.settle((PAYOUTS[outcome],))
+            return ActionResult(Transition.ROUND_OVER, (outcome,), PAYOUTS[outcome])
+        if player.has_natural():
+            outcome = Outcome.PUSH if self.dealer_has_blackjack else Outcome.BLACKJACK
+            player.ledger.settle((PAYOUTS[outcome],))
+            return ActionResult(Transition.ROUND_OVER, (outcome,), PAYOUTS[outcome])
 
-        # Handle split hands
-        if player.split_hand is not None:
-            pval1 = player.calculate_value()
-
-            # Calculate split hand value
-            split_total = sum(card.value for card in player.split_hand)
-            split_aces = sum(1 for c in player.split_hand if c.rank == "A")
-            split_values = {split_total}
-            for _ in range(split_aces):
-                split_total -= 10
-                split_values.add(split_total)
-            split_non_bust = [v for v in split_values if v <= 21]
-            pval2 = max(split_non_bust) if split_non_bust else min(split_values)
-
-            # Check if split hand is busted
-            hand1_busted = player.is_busted()
-            hand2_busted = all(v > 21 for v in split_values)
-
-            if hand1_busted and hand2_busted:
-                return "Both hands busted! Dealer wins."
-            elif hand1_busted:
-                if dval > pval2:
-                    return "Hand 1 busted, Hand 2 lost. Dealer wins both."
-                elif dval < pval2:
-                    return "Hand 1 busted, Hand 2 won! Push overall."
-                else:
-                    return "Hand 1 busted, Hand 2 push."
-            elif hand2_busted:
-                if dval > pval1:
-                    return "Hand 2 busted, Hand 1 lost. Dealer wins both."
-                elif dval < pval1:
-                    return "Hand 2 busted, Hand 1 won! Push overall."
-                else:
-                    return "Hand 2 busted, Hand 1 push."
+        dval = self.dealer.calculate_value()
+        dealer_busted = self.dealer.is_busted()
+        outcomes = []
+        net = 0.0
+        for hand in player.hands:
+            pval = hand.best_value()
+            if hand.is_busted():
+                outcome = Outcome.BUST
+            elif self.dealer_has_blackjack:
+                outcome = Outcome.LOSE
+            elif dealer_busted or pval > dval:
+                outcome = Outcome.WIN
+            elif pval < dval:
+                outcome = Outcome.LOSE
             else:
-                # Neither hand busted
-                wins = 0
-                if pval1 > dval:
-                    wins += 1
-                elif pval1 < dval:
-                    wins -= 1
-
-                if pval2 > dval:
-                    wins += 1
-                elif pval2 < dval:
-                    wins -= 1
-
-                if wins == 2:
-                    return "You win both hands!"
-                elif wins == 1:
-                    return "You win one hand, push on the other!"
-                elif wins == 0:
-                    return "Both hands push!"
-                elif wins == -1:
-                    return "You lose one hand, push on the other!"
-                else:
-                    return "Dealer wins both hands."
-
-        # Single hand logic
-        if dval > pval:
-            return "Dealer wins."
-        elif dval < pval:
-            return "You win!"
-        else:
-            return "Push: it's a tie."
+                outcome = Outcome.PUSH
+            outcomes.append(outcome)
+            net += PAYOUTS[outcome] * (2 if hand.doubled else 1)
+        player.ledger.settle([PAYOUTS[outcome] for outcome in outcomes])
+        return ActionResult(Transition.ROUND_OVER, tuple(outcomes), net)
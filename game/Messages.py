@@ -0,0 +1,111 @@
+from game.Outcome import Outcome, Transition
+
+
+def describe(game, seat_index, result, action=None):
+    """Human-readable sentence for an ActionResult of ``seat_index``.
+
+    ``action`` ("double", "split" or "surrender") is only needed to word
+    INVALID results.
+    Returns None when there is nothing to say.
+    """
+    player = game.slots[seat_index]
+    transition = result.transition
+
+    if transition == Transition.IGNORED:
+        return None
+    if transition == Transition.INVALID:
+        if action == "split":
+            return "Cannot split! You need two cards of the same value."
+        if action == "surrender":
+            return "Cannot surrender! Only your first two cards can be given up."
+        return "Cannot double! You need exactly 2 cards."
+    if transition == Transition.CONTINUE:
+        return None
+    if transition == Transition.SPLIT:
+        return "Hand split! Playing first hand."
+    if transition == Transition.NEXT_HAND:
+        previous = player.hands[player.active_hand - 1]
+        if previous.is_busted():
+            return "First hand busted! Playing split hand now."
+        if previous.doubled:
+            return "Double down complete! Playing split hand now."
+        return "First hand complete! Playing split hand now."
+    if transition == Transition.SEAT_DONE:
+        if player.split_hand is None and player.is_busted():
+            return "You busted! Dealer wins."
+        if player.surrendered:
+            return "You surrendered half your bet."
+        return "Waiting for the other players."
+    if len(result.outcomes) > 1:
+        return _describe_split(game, result.outcomes)
+    return _describe_single(game, result.outcomes[0])
+
+
+def _describe_single(game, outcome):
+    if outcome == Outcome.SURRENDER:
+        return "You surrendered. Half your bet is returned."
+    if outcome == Outcome.BLACKJACK:
+        return "Blackjack! You win!"
+    if outcome == Outcome.BUST:
+        return "You busted! Dealer wins."
+    if game.dealer_has_blackjack:
+        if outcome == Outcome.PUSH:
+            return "Push: both have Blackjack!"
+        return "Dealer has Blackjack. You lose."
+    if outcome == Outcome.WIN:
+        return "Dealer busted! You win!" if game.dealer.is_busted() else "You win!"
+    if outcome == Outcome.LOSE:
+        return "Dealer wins."
+    return "Push: it's a tie."
+
+
+def _describe_split(game, outcomes):
+    if len(outcomes) > 2:
+        return _describe_resplit(game, outcomes)
+    hand1, hand2 = outcomes[0], outcomes[1]
+    if hand1 == Outcome.BUST and hand2 == Outcome.BUST:
+        return "Both hands busted! Dealer wins."
+    if game.dealer_has_blackjack:
+        return "Dealer has Blackjack. You lose."
+    if Outcome.BUST in (hand1, hand2):
+        busted, other = (1, 2) if hand1 == Outcome.BUST else (2, 1)
+        other_outcome = outcomes[other - 1]
+        if other_outcome == Outcome.LOSE:
+            return f"Hand {busted} busted, Hand {other} lost. Dealer wins both."
+        if other_outcome == Outcome.WIN:
+            return f"Hand {busted} busted, Hand {other} won! Push overall."
+        return f"Hand {busted} busted, Hand {other} push."
+    if game.dealer.is_busted():
+        return "Dealer busted! You win both hands!"
+
+    wins = 0
+    for outcome in outcomes:
+        if outcome == Outcome.WIN:
+            wins += 1
+        elif outcome == Outcome.LOSE:
+            wins -= 1
+
+    if wins == 2:
+        return "You win both hands!"
+    elif wins == 1:
+        return "You win one hand, push on the other!"
+    elif wins == 0:
+        if Outcome.WIN in outcomes:
+            return "You win one hand, lose the other."
+        return "Both hands push!"
+    elif wins == -1:
+        return "You lose one hand, push on the other!"
+    else:
+        return "Dealer wins both hands."
+
+
+def _describe_resplit(game, outcomes):
+    if game.dealer_has_blackjack:
+        return "Dealer has Blackjack. You lose."
+    counts = []
+    for outcome, word in ((Outcome.WIN, "won"), (Outcome.PUSH, "pushed"),
+                          (Outcome.LOSE, "lost"), (Outcome.BUST, "busted")):
+        count = outcomes.count(outcome)
+        if count:
+            counts.append(f"{count} {word}")
+    return f"{len(outcomes)} hands: " + ", ".join(counts) + "."
@@ -0,0 +1,213 @@
+from time import perf_counter_ns
+
+from game.Outcome import Transition
+
+# Game methods that get a call counter and a latency histogram
+OPERATIONS = ("new_round", "player_hit", "player_stand", "player_double",
+              "player_split", "player_surrender", "dealer_play")
+
+# Quantiles reported by snapshots and the text exporter
+QUANTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of nanosecond latencies.
+
+    Values below ``2 ** precision_bits`` get a bucket each; above that every
+    power of two is split into ``2 ** (precision_bits - 1)`` equal buckets,
+    so any recorded value is reported within 1 / 2 ** (precision_bits - 1)
+    of its true value (1.6% with the default of 7 bits) however large it is.
+    """
+
+    def __init__(self, precision_bits=7):
+        self.bits = precision_bits
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value):
+        shift = value.bit_length() - self.bits
+        if shift <= 0:
+            return value
+        return (shift << (self.bits - 1)) + (value >> shift)
+
+    def _highest(self, index):
+        """Largest value that falls into bucket ``index``"""
+        half = 1 << (self.bits - 1)
+        if index < 2 * half:
+            return index
+        shift = (index >> (self.bits - 1)) - 1
+        return ((index - (shift << (self.bits - 1)) + 1) << shift) - 1
+
+    def record(self, value):
+        index = self._index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def percentile(self, q):
+        """Value at or below which ``q`` percent of the recordings fall"""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * q // 100))  # nearest rank, rounded up
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._highest(index), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, n in enumerate(other.counts):
+            self.counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        return self
+
+    def reset(self):
+        self.counts = []
+        self.count = self.total = self.max = 0
+        self.min = None
+
+
+class Metrics:
+    """Counters and latency histograms for one or more instrumented games.
+
+    Nothing is measured until ``instrument`` is called on a Game, and an
+    uninstrumented Game runs none of this code. Latencies are inclusive:
+    an action that ends the round also contains the dealer_play it
+    triggered, which is recorded on its own as well.
+    """
+
+    def __init__(self):
+        self.latency = {op: LatencyHistogram() for op in OPERATIONS}
+        self.rejected = dict.fromkeys(OPERATIONS, 0)  # IGNORED or INVALID results
+        self.deals = 0
+        self.reshuffles = 0
+
+    def reset(self):
+        for histogram in self.latency.values():
+            histogram.reset()
+        for op in self.rejected:  # in place: instrumented games hold these objects
+            self.rejected[op] = 0
+        self.deals = 0
+        self.reshuffles = 0
+
+    def merge(self, other):
+        for op, histogram in other.latency.items():
+            self.latency[op].merge(histogram)
+            self.rejected[op] += other.rejected[op]
+        self.deals += other.deals
+        self.reshuffles += other.reshuffles
+        return self
+
+    def snapshot(self):
+        """Plain-dict view of everything recorded so far; times in microseconds"""
+        ops = {}
+        for op, histogram in self.latency.items():
+            ops[op] = {
+                "calls": histogram.count,
+                "rejected": self.rejected[op],
+                "total_us": histogram.total / 1e3,
+                "mean_us": histogram.mean / 1e3,
+                "max_us": histogram.max / 1e3,
+                "quantiles_us": {q: histogram.percentile(q) / 1e3 for q in QUANTILES},
+            }
+        return {"ops": ops, "rounds": self.latency["new_round"].count,
+                "deals": self.deals, "reshuffles": self.reshuffles}
+
+    def export_text(self, prefix="blackjack"):
+        """Snapshot in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [f"# TYPE {prefix}_op_seconds summary"]
+        for op, stats in snapshot["ops"].items():
+            for q, us in stats["quantiles_us"].items():
+                lines.append(f'{prefix}_op_seconds{{op="{op}",quantile="{q / 100:g}"}} {us / 1e6:.9f}')
+            lines.append(f'{prefix}_op_seconds_sum{{op="{op}"}} {stats["total_us"] / 1e6:.9f}')
+            lines.append(f'{prefix}_op_seconds_count{{op="{op}"}} {stats["calls"]}')
+        lines.append(f"# TYPE {prefix}_op_rejected_total counter")
+        for op, stats in snapshot["ops"].items():
+            lines.append(f'{prefix}_op_rejected_total{{op="{op}"}} {stats["rejected"]}')
+        for name in ("rounds", "deals", "reshuffles"):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {snapshot[name]}")
+        return "\n".join(lines) + "\n"
+
+    def __str__(self):
+        lines = [f"{'op':<15}{'calls':>10}{'rejected':>10}{'mean us':>10}"
+                 f"{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+        snapshot = self.snapshot()
+        for op, stats in snapshot["ops"].items():
+            quantiles = stats["quantiles_us"]
+            lines.append(f"{op:<15}{stats['calls']:>10}{stats['rejected']:>10}"
+                         f"{stats['mean_us']:>10.2f}{quantiles[50]:>10.2f}"
+                         f"{quantiles[99]:>10.2f}{stats['max_us']:>10.2f}")
+        lines.append(f"rounds: {snapshot['rounds']}, deals: {snapshot['deals']}, "
+                     f"reshuffles: {snapshot['reshuffles']}")
+        return "\n".join(lines)
+
+
+def instrument(game, metrics=None):
+    """Start recording ``game`` (and its shoe) into ``metrics``, which may be
+    shared between games. The wrappers are instance attributes shadowing the
+    class methods, so ``uninstrument`` restores the untouched fast path."""
+    metrics = metrics or Metrics()
+    for op in OPERATIONS:
+        setattr(game, op, _timed(metrics, op, getattr(type(game), op).__get__(game)))
+
+    deck = game.deck
+    deal_card = type(deck).deal_card.__get__(deck)
+    build = type(deck).build.__get__(deck)
+
+    def counted_deal():
+        metrics.deals += 1
+        return deal_card()
+
+    def counted_build():
+        metrics.reshuffles += 1
+        return build()
+
+    deck.deal_card = counted_deal
+    deck.build = counted_build
+    game.metrics = metrics
+    return metrics
+
+
+def uninstrument(game):
+    for op in OPERATIONS:
+        game.__dict__.pop(op, None)
+    game.deck.__dict__.pop("deal_card", None)
+    game.deck.__dict__.pop("build", None)
+    game.__dict__.pop("metrics", None)
+
+
+def _timed(metrics, op, method):
+    histogram = metrics.latency[op]
+    rejected = metrics.rejected
+
+    def wrapper(*args):
+        start = perf_counter_ns()
+        result = method(*args)
+        histogram.record(perf_counter_ns() - start)
+        if result.transition <= Transition.INVALID:
+            rejected[op] += 1
+        return result
+    return wrapper
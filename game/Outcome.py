@@ -0,0 +1,38 @@
+from collections import namedtuple
+from enum import IntEnum
+
+
+class Outcome(IntEnum):
+    """Final result of one hand"""
+    LOSE = 0
+    PUSH = 1
+    WIN = 2
+    BLACKJACK = 3  # natural, pays 3:2
+    BUST = 4
+    SURRENDER = 5  # half the stake returned
+
+
+# Units won per unit staked, indexed by Outcome
+PAYOUTS = (-1.0, 0.0, 1.0, 1.5, -1.0, -0.5)
+
+
+class Transition(IntEnum):
+    """What an action did to the state of the round"""
+    IGNORED = 0  # no round in progress, or not this seat's turn
+    INVALID = 1  # action not allowed for the current hand
+    CONTINUE = 2  # the same hand keeps acting
+    SPLIT = 3  # hand split, playing the first hand
+    NEXT_HAND = 4  # moved on to the next split hand
+    SEAT_DONE = 5  # seat finished, waiting for the other seats
+    ROUND_OVER = 6  # dealer played and every seat is settled
+
+
+# outcomes: one Outcome per hand once settled; net: units won by the seat
+ActionResult = namedtuple("ActionResult", ("transition", "outcomes", "net"))
+
+IGNORED = ActionResult(Transition.IGNORED, (), 0.0)
+INVALID = ActionResult(Transition.INVALID, (), 0.0)
+CONTINUE = ActionResult(Transition.CONTINUE, (), 0.0)
+SPLIT = ActionResult(Transition.SPLIT, (), 0.0)
+NEXT_HAND = ActionResult(Transition.NEXT_HAND, (), 0.0)
+SEAT_DONE = ActionResult(Transition.SEAT_DONE, (), 0.0)
@@ -0,0 +1,112 @@
+class Rules:
+    """House rules of a table, resolved once into the flags and lookup
+    tables the engine reads in its hot paths.
+
+    ``num_decks`` decks per shoe; ``hit_soft_17`` makes the dealer hit a
+    soft 17 (H17) instead of standing on every 17 (S17);
+    ``double_after_split`` allows doubling split hands; ``max_hands`` caps
+    how many hands a seat can split into (2 means no resplits);
+    ``surrender`` lets a seat give up its first two cards for half the
+    stake, all of it if the dealer turns out to have blackjack.
+
+    Rules are immutable and hashable, so they can key caches of solved
+    strategy tables; use ``replace`` to derive a variant.
+    """
+    __slots__ = ("num_decks", "hit_soft_17", "double_after_split", "max_hands", "surrender",
+                 "dealer_hits")
+
+    def __init__(self, num_decks=5, hit_soft_17=False, double_after_split=True, max_hands=2,
+                 surrender=False):
+        if num_decks < 1 or max_hands < 1:
+            raise ValueError("a shoe needs at least one deck and a seat at least one hand")
+        set_ = object.__setattr__
+        set_(self, "num_decks", num_decks)
+        set_(self, "hit_soft_17", bool(hit_soft_17))
+        set_(self, "double_after_split", bool(double_after_split))
+        set_(self, "max_hands", max_hands)
+        set_(self, "surrender", bool(surrender))
+        # dealer_hits[hard][has_ace]: whether the dealer draws to a hand with
+        # this hard total (aces as 1), with or without an ace
+        set_(self, "dealer_hits", tuple((_dealer_hits(hard, False, hit_soft_17),
+                                         _dealer_hits(hard, True, hit_soft_17))
+                                        for hard in range(32)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Rules are immutable; use replace()")
+
+    def replace(self, **changes):
+        options = dict(zip(_OPTIONS, self.key))
+        options.update(changes)
+        return Rules(**options)
+
+    @property
+    def key(self):
+        return (self.num_decks, self.hit_soft_17, self.double_after_split, self.max_hands,
+                self.surrender)
+
+    @property
+    def code(self):
+        """Short tag such as "5d-s17-das-2h", e.g. for file names"""
+        parts = [f"{self.num_decks}d", "h17" if self.hit_soft_17 else "s17"]
+        if self.double_after_split:
+            parts.append("das")
+        parts.append(f"{self.max_hands}h")
+        if self.surrender:
+            parts.append("ls")
+        return "-".join(parts)
+
+    @classmethod
+    def from_code(cls, code):
+        """Rules from a ``code`` string; parts left out take the defaults
+        except "das", which has to be present to double after a split"""
+        options = {"double_after_split": False}
+        for part in code.split("-"):
+            if part in ("s17", "h17"):
+                options["hit_soft_17"] = part == "h17"
+            elif part == "das":
+                options["double_after_split"] = True
+            elif part == "ls":
+                options["surrender"] = True
+            elif part[-1:] in ("d", "h") and part[:-1].isdigit():
+                options["num_decks" if part[-1] == "d" else "max_hands"] = int(part[:-1])
+            else:
+                raise ValueError(f"unknown rule {part!r} in {code!r}")
+        return cls(**options)
+
+    def __eq__(self, other):
+        return isinstance(other, Rules) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __reduce__(self):
+        return Rules, self.key
+
+    def __repr__(self):
+        return "Rules(" + ", ".join(f"{name}={value!r}"
+                                    for name, value in zip(_OPTIONS, self.key)) + ")"
+
+
+_OPTIONS = ("num_decks", "hit_soft_17", "double_after_split", "max_hands", "surrender")
+
+
+def _dealer_hits(hard, has_ace, hit_soft_17):
+    if has_ace and hard <= 11:  # soft: one ace counts 11
+        total = hard + 10
+        return total < 17 or (total == 17 and hit_soft_17)
+    return hard < 17
+
+
+def add_arguments(parser):
+    """House rule options for an argparse command line; see from_args"""
+    parser.add_argument("--decks", type=int, default=5, help="decks per shoe (default: 5)")
+    parser.add_argument("--h17", action="store_true", help="dealer hits soft 17")
+    parser.add_argument("--no-das", action="store_true", help="no doubling after a split")
+    parser.add_argument("--max-hands", type=int, default=2,
+                        help="hands a seat can split into (default: 2, no resplits)")
+    parser.add_argument("--surrender", action="store_true", help="allow late surrender")
+
+
+def from_args(args):
+    return Rules(num_decks=args.decks, hit_soft_17=args.h17, double_after_split=not args.no_das,
+                 max_hands=args.max_hands, surrender=args.surrender)
@@ -0,0 +1,152 @@
+import struct
+
+from entities.Card import Card
+from entities.Deck import Deck
+from entities.Hand import Hand
+from entities.Ledger import Ledger
+from entities.Player import Player
+from game.Game import Game
+from game.Outcome import ActionResult, Outcome, Transition
+from game.Rules import Rules
+
+# Every card is stored as one byte, its index into Card.ALL
+MAGIC = b"BJGS"
+VERSION = 2
+# magic, version, seats, decks, cut card, round number, turn (-1 none), flags, shoe size,
+# then the table's Rules: decks, max hands (the other rules are flags)
+HEADER = struct.Struct("<4sBBHHIbBHHB")
+# bankroll, bet, wager count, finished, surrendered, active hand, hand count
+PLAYER = struct.Struct("<ddB??BB")
+SEAT = struct.Struct("<B")
+WAGER = struct.Struct("<d")
+RESULT = struct.Struct("<BBBd")  # seat, transition, outcome count, net
+
+(IN_ROUND, DEALER_BLACKJACK, PLAYER_BLACKJACK, LAZY, CONTINUOUS,
+ HIT_SOFT_17, DOUBLE_AFTER_SPLIT, SURRENDER) = (1 << bit for bit in range(8))
+
+
+def dumps(game):
+    """Whole table as compact bytes: house rules, shoe order, dealer, seats
+    with their hands, doubles, stakes and bankrolls, and the round state.
+
+    The shoe's random source and any pre-drawn shoe orders are not saved;
+    after a restore the game keeps shuffling with its own source.
+    """
+    deck = game.deck
+    rules = game.rules
+    flags = ((IN_ROUND if game.in_round else 0)
+             | (DEALER_BLACKJACK if game.dealer_has_blackjack else 0)
+             | (PLAYER_BLACKJACK if game.player_has_blackjack else 0)
+             | (LAZY if getattr(deck, "lazy", False) else 0)
+             | (CONTINUOUS if deck.continuous else 0)
+             | (HIT_SOFT_17 if rules.hit_soft_17 else 0)
+             | (DOUBLE_AFTER_SPLIT if rules.double_after_split else 0)
+             | (SURRENDER if rules.surrender else 0))
+    cards = deck.cards
+    turn = -1 if game.turn is None else game.turn
+    parts = [HEADER.pack(MAGIC, VERSION, len(game.slots), deck.num_decks, deck.cut_card,
+                         game.round_number, turn, flags, len(cards), rules.num_decks,
+                         rules.max_hands),
+             bytes(card.index for card in cards)]
+
+    _dump_player(parts, game.dealer)
+    for player in game.slots:
+        parts.append(SEAT.pack(player is not None))
+        if player is not None:
+            _dump_player(parts, player)
+
+    parts.append(SEAT.pack(len(game.results)))
+    for seat_index, result in game.results.items():
+        parts.append(RESULT.pack(seat_index, result.transition, len(result.outcomes), result.net))
+        parts.append(bytes(result.outcomes))
+    return b"".join(parts)
+
+
+def loads(data, game=None):
+    """Rebuild a table from ``dumps`` output. With ``game`` the state is
+    restored into it, keeping its shoe object, random source, event log
+    and metrics, and must play by the same rules; otherwise a new Game
+    with a matching Deck is returned."""
+    (magic, version, seats, num_decks, cut_card, round_number, turn, flags, shoe_size,
+     rule_decks, max_hands) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a game snapshot")
+    rules = Rules(rule_decks, bool(flags & HIT_SOFT_17), bool(flags & DOUBLE_AFTER_SPLIT),
+                  max_hands, bool(flags & SURRENDER))
+    offset = HEADER.size
+    cards = [Card.ALL[code] for code in data[offset:offset + shoe_size]]
+    offset += shoe_size
+
+    if game is None:
+        deck = Deck(num_decks, lazy=bool(flags & LAZY), continuous=bool(flags & CONTINUOUS))
+        deck.cut_card = cut_card
+        game = Game(num_slots=seats, deck=deck, rules=rules)
+    elif len(game.slots) != seats:
+        raise ValueError(f"snapshot has {seats} seats, the game {len(game.slots)}")
+    elif game.rules != rules:
+        raise ValueError(f"snapshot plays by {rules.code}, the game by {game.rules.code}")
+    game.deck.restore(cards)
+
+    game.dealer, offset = _load_player(data, offset, rules)
+    for seat_index in range(seats):
+        (occupied,), offset = SEAT.unpack_from(data, offset), offset + SEAT.size
+        player = None
+        if occupied:
+            player, offset = _load_player(data, offset, rules)
+        game.slots[seat_index] = player
+
+    (count,), offset = SEAT.unpack_from(data, offset), offset + SEAT.size
+    results = {}
+    for _ in range(count):
+        seat_index, transition, outcomes, net = RESULT.unpack_from(data, offset)
+        offset += RESULT.size
+        results[seat_index] = ActionResult(
+            Transition(transition), tuple(Outcome(o) for o in data[offset:offset + outcomes]), net)
+        offset += outcomes
+
+    game.results = results
+    game.round_number = round_number
+    game.turn = None if turn < 0 else turn
+    game.in_round = bool(flags & IN_ROUND)
+    game.dealer_has_blackjack = bool(flags & DEALER_BLACKJACK)
+    game.player_has_blackjack = bool(flags & PLAYER_BLACKJACK)
+    return game
+
+
+def _dump_player(parts, player):
+    name = player.name.encode()
+    ledger = player.ledger
+    parts.append(bytes((len(name),)) + name)
+    parts.append(PLAYER.pack(ledger.bankroll, ledger.bet, len(ledger.wagers), player.finished,
+                             player.surrendered, player.active_hand, len(player.hands)))
+    parts.append(b"".join(WAGER.pack(wager) for wager in ledger.wagers))
+    for hand in player.hands:
+        parts.append(bytes((hand.doubled, len(hand))))
+        parts.append(bytes(card.index for card in hand))
+
+
+def _load_player(data, offset, rules):
+    length = data[offset]
+    name = bytes(data[offset + 1:offset + 1 + length]).decode()
+    offset += 1 + length
+    bankroll, bet, wagers, finished, surrendered, active_hand, hands = \
+        PLAYER.unpack_from(data, offset)
+    offset += PLAYER.size
+
+    player = Player(name, max_hands=rules.max_hands,
+                    double_after_split=rules.double_after_split, surrender=rules.surrender)
+    player.ledger = Ledger(bankroll, bet)
+    player.ledger.wagers = [WAGER.unpack_from(data, offset + i * WAGER.size)[0]
+                            for i in range(wagers)]
+    offset += wagers * WAGER.size
+    player.hands = []
+    for _ in range(hands):
+        doubled, size = data[offset], data[offset + 1]
+        offset += 2
+        player.hands.append(Hand([Card.ALL[code] for code in data[offset:offset + size]],
+                                 bool(doubled)))
+        offset += size
+    player.finished = finished
+    player.surrendered = surrendered
+    player.active_hand = active_hand
+    return player, offset
@@ -1,10 +1,28 @@
+from game.Game import Game
+from game.Rules import add_arguments, from_args
 from GUI.GameGUI import GameGUI
 
 
 def main():
-    game = GameGUI()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Blackjack")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="play at a server.TableServer table instead of locally")
+    parser.add_argument("--table", default="main", help="table to join on the server")
+    add_arguments(parser)  # local play only; a server table has its own rules
+    args = parser.parse_args()
+
+    if args.connect:
+        from GUI.RemoteGame import RemoteGame
+        host, _, port = args.connect.rpartition(":")
+        table = RemoteGame(host or "127.0.0.1", int(port), args.table)
+    else:
+        table = Game(num_slots=7, rules=from_args(args))
+
+    game = GameGUI(table)
     game.mainloop()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
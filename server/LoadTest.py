@@ -0,0 +1,206 @@
+import asyncio
+import time
+import tracemalloc
+
+from entities.Player import Player
+from game.Outcome import Transition
+from game.Rules import Rules
+from server import Protocol
+from server.TableServer import Table, TableServer
+from simulation.Simulator import dealer_policy, legal_action
+
+
+class _TableMirror:
+    """Client-side view of a table, filled in by Protocol.apply_state"""
+
+    def __init__(self):
+        self.rules = Rules()
+        self.dealer = Player("Dealer")
+        self.slots = []
+        self.in_round = False
+        self.turn = None
+        self.results = {}
+
+
+class TableStats:
+    def __init__(self):
+        self.rounds = 0
+        self.started = None
+        self.finished = None
+        self.done = False
+
+
+class LoadReport:
+    def __init__(self, latencies, tables, elapsed, bytes_per_table):
+        self.latencies = latencies  # op -> list of seconds
+        self.tables = tables  # table id -> TableStats
+        self.elapsed = elapsed
+        self.bytes_per_table = bytes_per_table
+
+    def __str__(self):
+        lines = [f"{'op':<10}{'count':>10}{'p50 ms':>10}{'p99 ms':>10}"]
+        everything = [s for samples in self.latencies.values() for s in samples]
+        for op, samples in sorted(self.latencies.items()) + [("all", everything)]:
+            lines.append(f"{op:<10}{len(samples):>10}"
+                         f"{percentile(samples, 50) * 1e3:>10.3f}"
+                         f"{percentile(samples, 99) * 1e3:>10.3f}")
+
+        rates = [stats.rounds / (stats.finished - stats.started)
+                 for stats in self.tables.values() if stats.finished and stats.started]
+        total_rounds = sum(stats.rounds for stats in self.tables.values())
+        lines.append(f"{len(self.tables)} tables, {total_rounds} rounds in {self.elapsed:.2f}s "
+                     f"({total_rounds / self.elapsed:,.0f} rounds/s overall)")
+        if rates:
+            lines.append(f"rounds/s per table: min {min(rates):.1f}, "
+                         f"mean {sum(rates) / len(rates):.1f}, max {max(rates):.1f}")
+        lines.append(f"memory per table: {self.bytes_per_table / 1024:.1f} KiB "
+                     f"(standalone estimate, see measure_table_memory)")
+        return "\n".join(lines)
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a list of latencies"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+async def run_bot(host, port, table_id, seat, leader, seats, rounds, stats, latencies,
+                  policy=dealer_policy):
+    """One scripted client. The leader (lowest seat) starts every round
+    once the table is full and leaves after ``rounds`` rounds."""
+    reader, writer = await asyncio.open_connection(host, port)
+    mirror = _TableMirror()
+    state = None  # latest table state dict
+    request_id = 0
+    pending = None  # (id, op, sent at)
+
+    def send(op, **fields):
+        nonlocal request_id, pending
+        request_id += 1
+        pending = (request_id, op, time.perf_counter())
+        writer.write(Protocol.encode(dict(fields, id=request_id, op=op)))
+
+    send("join", table=table_id, seat=seat, name=f"bot{seat}")
+    try:
+        while not stats.done:
+            line = await reader.readline()
+            if not line:
+                break
+            message = Protocol.decode(line)
+            state = message.get("state", state)
+            if pending and message.get("id") == pending[0]:
+                latencies.setdefault(pending[1], []).append(time.perf_counter() - pending[2])
+                if not message.get("ok"):
+                    raise RuntimeError(f"table {table_id} seat {seat}: {pending[1]!r} failed: "
+                                       f"{message.get('error')}")
+                if (pending[1] != "join"
+                        and Protocol.decode_result(message["result"]).transition
+                        == Transition.INVALID):
+                    # the state did not change, re-sending would loop forever
+                    raise RuntimeError(f"table {table_id} seat {seat}: server rejected "
+                                       f"{pending[1]!r} as invalid")
+                pending = None
+            if pending or state is None:
+                continue
+
+            if state["in_round"] and state["turn"] == seat:
+                # Only rebuild the table objects when this bot has to decide
+                Protocol.apply_state(mirror, state)
+                player = mirror.slots[seat]
+                send(legal_action(player, policy(player, mirror.dealer.hand[1])))
+            elif leader and not state["in_round"] and sum(1 for s in state["seats"] if s) == seats:
+                if stats.started is None:
+                    stats.started = time.perf_counter()
+                elif state["results"]:
+                    stats.rounds += 1
+                if stats.rounds >= rounds:
+                    stats.finished = time.perf_counter()
+                    stats.done = True
+                    break
+                send("new_round")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+def measure_table_memory(count=200):
+    """Average bytes allocated by one idle, fully seated table. This is an
+    estimate from ``count`` freshly built standalone Tables, not a
+    measurement of the tables a server hosted during a run."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tables = []
+    for i in range(count):
+        table = Table(f"m{i}")
+        for seat in range(len(table.game.slots)):
+            table.game.sit_down(seat, f"bot{seat}")
+        table.game.new_round()
+        tables.append(table)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / count
+
+
+async def run_load(tables=100, seats=7, rounds=50, host=None, port=None, policy=dealer_policy):
+    """Drive ``tables`` x ``seats`` bots. Without ``host`` a TableServer is
+    started in this process on a free port; bots and server then share one
+    event loop, so point ``host`` at a separate server process for latency
+    figures that do not include the bots' own work."""
+    server = None
+    if host is None:
+        server = await TableServer(port=0, action_timeout=60.0, max_tables=tables).start()
+        host, port = server.host, server.port
+
+    latencies = {}
+    table_stats = {f"load{t}": TableStats() for t in range(tables)}
+    start = time.perf_counter()
+    bots = [run_bot(host, port, table_id, seat, seat == 0, seats, rounds, stats, latencies, policy)
+            for table_id, stats in table_stats.items() for seat in range(seats)]
+    await asyncio.gather(*bots)
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+    return LoadReport(latencies, table_stats, elapsed, measure_table_memory())
+
+
+def _raise_fd_limit():
+    """Each in-process bot needs two sockets; lift the soft fd limit if we can"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or hard > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY else 65536, hard))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test the blackjack table server")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--seats", type=int, default=7, help="bots per table (1-7)")
+    parser.add_argument("--rounds", type=int, default=50, help="rounds per table")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="load an already running server instead of an in-process one")
+    parser.add_argument("--policy", choices=("dealer", "basic"), default="dealer")
+    args = parser.parse_args()
+
+    host = port = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        port = int(port)
+    policy = dealer_policy
+    if args.policy == "basic":
+        from strategy.StrategyTable import basic_strategy_policy
+        policy = basic_strategy_policy
+
+    _raise_fd_limit()
+    print(asyncio.run(run_load(args.tables, args.seats, args.rounds, host, port, policy)))
+
+
+if __name__ == "__main__":
+    main()
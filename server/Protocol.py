@@ -0,0 +1,94 @@
+"""Wire format shared by server.TableServer and GUI.RemoteGame.
+
+Messages are JSON objects, one per line. Cards travel as Card.index; the
+dealer's hole card is sent as null while the round is in progress.
+"""
+import json
+
+from entities.Card import Card
+from entities.Hand import Hand
+from entities.Player import Player
+from game.Outcome import ActionResult, Outcome, Transition
+from game.Rules import Rules
+
+HOLE_CARD = "[Hidden]"  # stands in for the dealer's face-down card on clients
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+def decode(line):
+    return json.loads(line)
+
+
+def encode_result(result):
+    return [int(result.transition), [int(o) for o in result.outcomes], result.net]
+
+
+def decode_result(data):
+    transition, outcomes, net = data
+    return ActionResult(Transition(transition), tuple(Outcome(o) for o in outcomes), net)
+
+
+def encode_state(game):
+    """Public view of a table, as pushed to every client at it"""
+    dealer_cards = [card.index for card in game.dealer.hand]
+    if game.in_round and dealer_cards:
+        dealer_cards[0] = None
+    return {
+        "in_round": game.in_round,
+        "turn": game.turn,
+        "dealer_has_blackjack": game.dealer_has_blackjack,
+        "player_has_blackjack": game.player_has_blackjack,
+        "dealer": dealer_cards,
+        "seats": [_encode_player(player) if player else None for player in game.slots],
+        "results": {str(seat): encode_result(result) for seat, result in game.results.items()},
+        "cards_left": len(game.deck),
+        "rules": list(game.rules.key),
+    }
+
+
+def _encode_player(player):
+    return {
+        "name": player.name,
+        "hands": [[card.index for card in hand] for hand in player.hands],
+        "doubled": [hand.doubled for hand in player.hands],
+        "active_hand": player.active_hand,
+        "finished": player.finished,
+        "surrendered": player.surrendered,
+        "bankroll": player.ledger.bankroll,
+        "bet": player.ledger.bet,
+    }
+
+
+def apply_state(game, state):
+    """Rebuild a client-side mirror of the table from an encode_state dict"""
+    game.in_round = state["in_round"]
+    game.turn = state["turn"]
+    game.dealer_has_blackjack = state["dealer_has_blackjack"]
+    game.player_has_blackjack = state["player_has_blackjack"]
+
+    game.dealer.reset_hand()
+    for code in state["dealer"]:
+        if code is None:
+            list.append(game.dealer.hand, HOLE_CARD)  # not counted in the total
+        else:
+            game.dealer.hand.append(Card.ALL[code])
+
+    game.rules = rules = Rules(*state["rules"])
+    game.slots = [_decode_player(seat, rules) if seat else None for seat in state["seats"]]
+    game.results = {int(seat): decode_result(result) for seat, result in state["results"].items()}
+    game.cards_left = state["cards_left"]
+
+
+def _decode_player(data, rules):
+    player = Player(data["name"], data["bankroll"], rules.max_hands, rules.double_after_split,
+                    rules.surrender)
+    player.ledger.bet = data["bet"]
+    player.hands = [Hand([Card.ALL[code] for code in cards], doubled)
+                    for cards, doubled in zip(data["hands"], data["doubled"])]
+    player.active_hand = data["active_hand"]
+    player.finished = data["finished"]
+    player.surrendered = data["surrendered"]
+    return player
@@ -0,0 +1,261 @@
+import asyncio
+
+from game import Metrics
+from game.Game import Game
+from game.Rules import add_arguments, from_args
+from server import Protocol
+
+# Looked up on the game instance, so game.Metrics wrappers are honoured
+ACTIONS = {
+    "hit": "player_hit",
+    "stand": "player_stand",
+    "double": "player_double",
+    "split": "player_split",
+    "surrender": "player_surrender",
+}
+
+
+class ProtocolError(Exception):
+    """A client request that cannot be served; sent back as an error reply"""
+
+
+class Table:
+    """One Game plus the clients watching it"""
+
+    def __init__(self, table_id, num_slots=7, deck=None, rules=None):
+        self.table_id = table_id
+        self.game = Game(num_slots=num_slots, deck=deck, rules=rules)
+        self.sessions = set()
+        self.leaving = set()  # seats whose client left mid-round
+        self.round_number = 0
+        self.timer = None  # pending auto-stand for the seat whose turn it is
+        self.timer_turn = None
+
+
+class Session:
+    """One connected client: at most one seat at one table"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.table = None
+        self.seat = None
+
+
+class TableServer:
+    """Hosts many concurrent tables over a line-delimited JSON TCP protocol.
+
+    Requests look like ``{"id": 1, "op": "hit"}`` and get a reply with the
+    same id holding either an ``error`` or the ``result`` and the table
+    ``state``; every other client at the table is pushed
+    ``{"event": "state", ...}``. A seat that does not act within
+    ``action_timeout`` seconds is stood for. With a game.Metrics.Metrics
+    every table is instrumented into it and the ``metrics`` op returns its
+    snapshot. Every table plays by the same game.Rules.Rules.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, action_timeout=30.0,
+                 max_tables=1000, deck_factory=None, metrics=None, rules=None):
+        self.host = host
+        self.port = port
+        self.action_timeout = action_timeout
+        self.max_tables = max_tables
+        self.deck_factory = deck_factory  # callable returning a new shoe per table
+        self.metrics = metrics
+        self.rules = rules
+        self.tables = {}
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # resolve port 0
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        for table in self.tables.values():
+            if table.timer:
+                table.timer.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def get_table(self, table_id):
+        table = self.tables.get(table_id)
+        if table is None:
+            if len(self.tables) >= self.max_tables:
+                raise ProtocolError("server is full")
+            deck = self.deck_factory() if self.deck_factory else None
+            table = self.tables[table_id] = Table(table_id, deck=deck, rules=self.rules)
+            if self.metrics is not None:
+                Metrics.instrument(table.game, self.metrics)
+        return table
+
+    async def _serve_client(self, reader, writer):
+        session = Session(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = self._handle_line(session, line)
+                writer.write(Protocol.encode(reply))
+                if session.table is not None:
+                    self._push_state(session.table, exclude=session)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._leave(session)
+            writer.close()
+
+    def _handle_line(self, session, line):
+        request_id = None
+        try:
+            message = Protocol.decode(line)
+            request_id = message.get("id")
+            result = self._dispatch(session, message)
+        except ProtocolError as exc:
+            return {"id": request_id, "ok": False, "error": str(exc)}
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            return {"id": request_id, "ok": False, "error": f"bad request: {exc}"}
+
+        reply = {"id": request_id, "ok": True, "result": result}
+        if session.table is not None:
+            self._advance(session.table)
+            reply["state"] = Protocol.encode_state(session.table.game)
+        return reply
+
+    def _dispatch(self, session, message):
+        op = message["op"]
+        if op == "join":
+            return self._join(session, message["table"], int(message["seat"]),
+                              message.get("name", "Player"))
+        if op == "state":
+            return None
+        if op == "metrics":
+            if self.metrics is None:
+                raise ProtocolError("metrics are disabled")
+            return self.metrics.snapshot()
+
+        if session.table is None:
+            raise ProtocolError("join a table first")
+        table = session.table
+        game = table.game
+
+        if op == "leave":
+            self._leave(session)
+            return True
+        if op == "bet":
+            return game.place_bet(session.seat, float(message["amount"]))
+        if op == "new_round":
+            if game.in_round:
+                raise ProtocolError("round already in progress")
+            table.round_number += 1
+            return Protocol.encode_result(game.new_round())
+        if op in ACTIONS:
+            return Protocol.encode_result(getattr(game, ACTIONS[op])(session.seat))
+        raise ProtocolError(f"unknown op {op!r}")
+
+    def _join(self, session, table_id, seat, name):
+        if session.table is not None:
+            raise ProtocolError("already seated")
+        table = self.get_table(table_id)
+        if not 0 <= seat < len(table.game.slots):
+            raise ProtocolError("no such seat")
+        if table.game.in_round or seat in table.leaving or not table.game.sit_down(seat, name):
+            raise ProtocolError("seat is taken or a round is in progress")
+        session.table = table
+        session.seat = seat
+        table.sessions.add(session)
+        return seat
+
+    def _leave(self, session):
+        table = session.table
+        if table is None:
+            return
+        table.leaving.add(session.seat)
+        table.sessions.discard(session)
+        session.table = session.seat = None
+        if not table.sessions:
+            if table.timer:
+                table.timer.cancel()
+            del self.tables[table.table_id]
+            return
+        self._advance(table)
+        self._push_state(table)
+
+    def _advance(self, table):
+        """Stand for seats whose client left, free them once the round is
+        over, and rearm the action timer"""
+        game = table.game
+        while game.in_round and game.turn in table.leaving:
+            game.player_stand(game.turn)
+        if not game.in_round:
+            for seat in list(table.leaving):
+                if game.stand_up(seat):
+                    table.leaving.discard(seat)
+        self._schedule_timeout(table)
+
+    def _push_state(self, table, exclude=None):
+        event = Protocol.encode({"event": "state", "table": table.table_id,
+                                 "state": Protocol.encode_state(table.game)})
+        for other in table.sessions:
+            if other is not exclude:
+                other.writer.write(event)
+
+    def _schedule_timeout(self, table):
+        """(Re)arm the action timer whenever the turn moves to another seat"""
+        game = table.game
+        turn = (table.round_number, game.turn) if game.in_round else None
+        if turn == table.timer_turn:
+            return
+        if table.timer:
+            table.timer.cancel()
+            table.timer = None
+        table.timer_turn = turn
+        if turn is not None and self.action_timeout:
+            loop = asyncio.get_running_loop()
+            table.timer = loop.call_later(self.action_timeout, self._on_timeout, table, turn)
+
+    def _on_timeout(self, table, turn):
+        table.timer = None
+        game = table.game
+        if not game.in_round or (table.round_number, game.turn) != turn:
+            return
+        seat = game.turn
+        while game.in_round and game.turn == seat:
+            game.player_stand(seat)
+        self._advance(table)
+        self._push_state(table)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Multi-table blackjack server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="seconds a seat has to act before it is stood for")
+    parser.add_argument("--max-tables", type=int, default=1000)
+    parser.add_argument("--metrics", action="store_true",
+                        help="record per-operation latencies, served by the metrics op")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    metrics = Metrics.Metrics() if args.metrics else None
+    server = TableServer(args.host, args.port, args.timeout, args.max_tables, metrics=metrics,
+                         rules=from_args(args))
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import numpy as np
+
+from game.Outcome import PAYOUTS
+
+# Units won per unit staked, indexed by Outcome value
+PAYOUT_TABLE = np.array(PAYOUTS, dtype=np.float64)
+
+
+def settle_batch(outcomes, stakes, payouts=PAYOUT_TABLE):
+    """Net win of every hand in one vectorised pass.
+
+    ``outcomes`` is an integer array of Outcome values and ``stakes`` the
+    matching wagers (a scalar works too, e.g. 1 for flat betting).
+    """
+    return payouts[np.asarray(outcomes, dtype=np.intp)] * stakes
+
+
+def settle_rounds(round_index, outcomes, stakes, num_rounds=None, payouts=PAYOUT_TABLE):
+    """Net win per round from hand-level arrays.
+
+    ``round_index`` gives the round each hand belongs to, so split hands
+    and several seats fold into one figure per round.
+    """
+    nets = settle_batch(outcomes, stakes, payouts)
+    return np.bincount(round_index, weights=nets, minlength=num_rounds or 0)
+
+
+def hand_nets(columns):
+    """Net win of every hand of a simulation.HandStore (see read_hands)"""
+    return settle_batch(columns["outcome"], columns["stake"])
+
+
+def round_nets(columns):
+    """Net win of every round of a simulation.HandStore, all seats together.
+
+    A round's hands are stored next to each other, so a new round starts
+    wherever the round number changes (stores appended to by several runs
+    repeat round numbers).
+    """
+    rounds = columns["round"]
+    if not len(rounds):
+        return np.zeros(0)
+    round_index = np.concatenate(([0], np.cumsum(rounds[1:] != rounds[:-1])))
+    return settle_rounds(round_index, columns["outcome"], columns["stake"])
+
+
+def bankroll_path(bankroll, round_nets):
+    """Bankroll after each round, starting from ``bankroll``"""
+    return bankroll + np.cumsum(round_nets)
+
+
+def risk_summary(bankroll, round_nets):
+    """Final bankroll, deepest drawdown and whether the bankroll was ever lost"""
+    path = bankroll_path(bankroll, round_nets)
+    peaks = np.maximum.accumulate(np.concatenate(([bankroll], path)))[1:]
+    return {
+        "final": float(path[-1]) if len(path) else float(bankroll),
+        "max_drawdown": float((peaks - path).max()) if len(path) else 0.0,
+        "ruined": bool(len(path) and path.min() <= 0),
+    }
@@ -0,0 +1,186 @@
+import json
+import os
+
+import numpy as np
+
+from audit.EventLog import ACTION_CODES, ACTIONS
+from entities.Hand import Hand
+
+# One file per column, <path>/<name>.npy, row i of every column is one hand
+COLUMNS = (
+    ("round", np.uint32),
+    ("seat", np.uint8),
+    ("hand", np.uint8),  # position among the seat's split hands
+    ("card1", np.uint8),  # Card.index of the hand's first two cards
+    ("card2", np.uint8),
+    ("upcard", np.uint8),  # Card.index of the dealer's up-card
+    ("actions", np.uint64),  # ACTIONS code + 1 per action, 4 bits each, first lowest
+    ("num_actions", np.uint8),
+    ("total", np.uint8),  # final best total of the hand
+    ("dealer_total", np.uint8),
+    ("outcome", np.uint8),  # game.Outcome.Outcome
+    ("stake", np.uint8),  # in initial bets, 2 once doubled
+)
+MAX_ACTIONS = 16  # that fit in the actions column; later ones are not stored
+META = "hands.json"
+VERSION = 2
+DOUBLE = ACTION_CODES["double"]
+
+
+class HandStore:
+    """Columnar per-hand record of simulated rounds in memory-mapped NumPy
+    files, read back zero-copy with read_hands.
+
+    Pass it to game.Game as the ``event_log``: it follows the deals and
+    actions of each round and adds one row per settled hand. Rows are
+    buffered and written ``chunk_rows`` at a time into columns preallocated
+    for ``capacity`` hands, which double in size when full. An existing
+    store at ``path`` is appended to. Nets are not stored: settle the
+    outcome and stake columns in bulk with simulation.BatchSettlement.
+    """
+
+    def __init__(self, path, capacity=1 << 20, chunk_rows=1 << 16):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        os.makedirs(path, exist_ok=True)
+        meta = _read_meta(path)
+        self.rows = meta["rows"] if meta else 0
+        self.capacity = max(capacity, meta["capacity"] if meta else 0)
+        self.columns = {}
+        for name, dtype in COLUMNS:
+            self.columns[name] = self._open_column(name, dtype, meta)
+        self._pending = []
+        self._dealer = Hand()
+        self._hands = {}  # seat -> Hands of the round in play
+        self._actions = {}  # seat -> action codes per hand
+
+    def _open_column(self, name, dtype, meta):
+        file = _column_path(self.path, name)
+        if meta and meta["capacity"] == self.capacity:
+            return np.lib.format.open_memmap(file, mode="r+")
+        column = np.lib.format.open_memmap(file + ".tmp", mode="w+", dtype=dtype,
+                                           shape=(self.capacity,))
+        if meta:
+            column[:self.rows] = np.load(file, mmap_mode="r")[:self.rows]
+        column.flush()
+        os.replace(file + ".tmp", file)
+        return column
+
+    # Event log interface used by game.Game
+
+    def shuffle(self, round_number, num_decks):
+        pass
+
+    def round(self, round_number, seats):
+        self._dealer = Hand()
+        self._hands = {}
+        self._actions = {}
+
+    def deal(self, round_number, seat, hand, card):
+        if seat < 0:
+            self._dealer.append(card)
+            return
+        hands = self._hands.get(seat)
+        if hands is None:
+            hands = self._hands[seat] = [Hand()]
+            self._actions[seat] = [[]]
+        hands[hand].append(card)
+
+    def action(self, round_number, seat, hand, action):
+        actions = self._actions[seat]
+        actions[hand].append(ACTION_CODES[action])
+        if action == "split":
+            # Game inserts the new hand right after the split one; both keep
+            # the history up to the split
+            hands = self._hands[seat]
+            hands.insert(hand + 1, Hand([hands[hand].pop()]))
+            actions.insert(hand + 1, list(actions[hand]))
+
+    def settle(self, round_number, seat, hand, outcome, net):
+        cards = self._hands[seat][hand]
+        actions = self._actions[seat][hand]
+        codes = actions[:MAX_ACTIONS]
+        packed = 0
+        for i, code in enumerate(codes):
+            packed |= (code + 1) << (4 * i)
+        self._pending.append((round_number, seat, hand, cards[0].index, cards[1].index,
+                              self._dealer[1].index, packed, len(codes),
+                              min(cards.best_value(), 255), self._dealer.best_value(),
+                              int(outcome), 2 if DOUBLE in actions else 1))
+        if len(self._pending) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows out and record the new row count"""
+        count = len(self._pending)
+        if not count:
+            return
+        if self.rows + count > self.capacity:
+            self._grow(self.rows + count)
+        start, end = self.rows, self.rows + count
+        for (name, dtype), values in zip(COLUMNS, zip(*self._pending)):
+            column = self.columns[name]
+            column[start:end] = np.fromiter(values, dtype, count)
+            column.flush()
+        self._pending = []
+        self.rows = end
+        self._write_meta()
+
+    def _grow(self, needed):
+        meta = {"rows": self.rows, "capacity": self.capacity}
+        while self.capacity < needed:
+            self.capacity *= 2
+        for name, dtype in COLUMNS:
+            old = self.columns.pop(name)
+            self.columns[name] = self._open_column(name, dtype, meta)
+            del old
+        self._write_meta()
+
+    def _write_meta(self):
+        file = os.path.join(self.path, META)
+        with open(file + ".tmp", "w") as f:
+            json.dump({"version": VERSION, "rows": self.rows, "capacity": self.capacity,
+                       "columns": [name for name, _ in COLUMNS]}, f)
+        os.replace(file + ".tmp", file)
+
+    def close(self):
+        self.flush()
+        self._write_meta()
+        self.columns = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_hands(path):
+    """Every column of a store as a read-only memory-mapped array, trimmed
+    to the rows written so far; nothing is loaded until it is sliced"""
+    meta = _read_meta(path)
+    if meta is None:
+        raise FileNotFoundError(f"no hand store at {path}")
+    return {name: np.load(_column_path(path, name), mmap_mode="r")[:meta["rows"]]
+            for name, _ in COLUMNS}
+
+
+def decode_actions(packed, count):
+    """Action names of one row's ``actions`` and ``num_actions``"""
+    packed = int(packed)
+    return tuple(ACTIONS[((packed >> (4 * i)) & 0xF) - 1] for i in range(count))
+
+
+def _column_path(path, name):
+    return os.path.join(path, name + ".npy")
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, META)) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    if meta.get("version") != VERSION:
+        raise ValueError(f"{path} is not a compatible hand store")
+    return meta
@@ -0,0 +1,93 @@
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from entities.Deck import Deck
+from game.Game import Game
+from game.Rules import Rules, add_arguments, from_args
+from simulation.Simulator import Simulator, SimulationResult, dealer_policy
+from simulation.Statistics import OutcomeStatistics
+
+
+def chunk_rng(seed, chunk_index):
+    """Independent, reproducible random stream for one chunk of rounds"""
+    return random.Random(f"{seed}:{chunk_index}")
+
+
+def run_chunk(task):
+    """Simulate one chunk of rounds on a freshly seeded shoe (runs in a worker)"""
+    seed, chunk_index, rounds, policy, rules, confidence = task
+    game = Game(num_slots=1, deck=Deck(num_decks=rules.num_decks,
+                                       rng=chunk_rng(seed, chunk_index)), rules=rules)
+    stats = OutcomeStatistics(confidence) if confidence is not None else None
+    return Simulator(policy=policy, game=game).run(rounds, SimulationResult(stats))
+
+
+def run_parallel(rounds, seed=0, workers=None, policy=dealer_policy, chunk_size=50_000,
+                 rules=None, confidence=None, target_width=None):
+    """Simulate ``rounds`` rounds across a process pool.
+
+    Work is cut into fixed chunks, each with its own shoe seeded from
+    (seed, chunk index), and partial tallies are reduced in chunk order.
+    The result therefore only depends on ``seed`` and ``chunk_size``, not on
+    the number of workers. ``policy`` must be picklable (a module-level
+    function, or e.g. a strategy.StrategyTable.TablePolicy).
+
+    With a ``confidence`` level the result carries OutcomeStatistics. With
+    ``target_width`` too, ``rounds`` is a cap: chunks are merged in order
+    until the house edge interval is that narrow, and the rest are
+    cancelled, so the stopping point is just as reproducible.
+    """
+    rules = rules or Rules()
+    if target_width is not None and confidence is None:
+        confidence = 0.95
+    tasks = []
+    for chunk_index, start in enumerate(range(0, rounds, chunk_size)):
+        rounds_in_chunk = min(chunk_size, rounds - start)
+        tasks.append((seed, chunk_index, rounds_in_chunk, policy, rules, confidence))
+
+    total = SimulationResult()
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with Pool(processes=workers) as pool:
+        # imap yields in submission order while later chunks keep running
+        for partial in pool.imap(run_chunk, tasks):
+            total.merge(partial)
+            if target_width is not None and total.stats.converged(target_width):
+                break  # leaving the block terminates the chunks still running
+    total.elapsed = time.perf_counter() - start  # wall clock, not summed CPU time
+    return total
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Multiprocess blackjack simulation")
+    parser.add_argument("rounds", type=int, nargs="?", default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--policy", choices=("dealer", "basic"), default="dealer")
+    parser.add_argument("--stats", action="store_true",
+                        help="confidence interval and per-up-card breakdown of the EV")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--target-width", type=float, default=None,
+                        help="stop once the house edge interval is this wide (e.g. 0.002)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    rules = from_args(args)
+    policy = dealer_policy
+    if args.policy == "basic":
+        from strategy.StrategyTable import StrategyTable, TablePolicy
+        StrategyTable.load_or_solve(rules=rules)  # persist the table once, before forking workers
+        policy = TablePolicy(rules)
+    print(run_parallel(args.rounds, seed=args.seed, workers=args.workers,
+                       policy=policy, chunk_size=args.chunk_size, rules=rules,
+                       confidence=args.confidence if args.stats else None,
+                       target_width=args.target_width))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import time
+
+from entities.Deck import Deck
+from game.Game import Game
+from game.Outcome import Outcome
+from game.Rules import add_arguments, from_args
+from simulation.Statistics import OutcomeStatistics
+
+
+def dealer_policy(player, dealer_upcard):
+    """Mimic the dealer: hit below 17, otherwise stand"""
+    if player.get_current_value() < 17:
+        return "hit"
+    return "stand"
+
+
+def legal_action(player, action):
+    """``action`` if the player may take it now, otherwise "hit" (any
+    unknown or illegal double, split or surrender becomes a hit)"""
+    if action == "stand" or action == "hit":
+        return action
+    if ((action == "double" and player.can_double()) or (action == "split" and player.can_split())
+            or (action == "surrender" and player.can_surrender())):
+        return action
+    return "hit"
+
+
+class SimulationResult:
+    """Running tally of simulated rounds, mergeable across runs. With a
+    simulation.Statistics.OutcomeStatistics in ``stats`` every seat's net is
+    also streamed into it for confidence intervals."""
+
+    def __init__(self, stats=None):
+        self.stats = stats
+        self.rounds = 0
+        self.bets = 0  # initial bets placed, one per seat per round
+        self.hands = 0
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+        self.blackjacks = 0
+        self.surrenders = 0  # also counted as losses
+        self.net_units = 0.0
+        self.elapsed = 0.0
+
+    def add(self, seat_result, upcard=None):
+        """Count one seat's settled ActionResult against the dealer ``upcard``"""
+        if self.stats is not None:
+            self.stats.add(seat_result.net, upcard)
+        self.bets += 1
+        self.hands += len(seat_result.outcomes)
+        self.net_units += seat_result.net
+        for outcome in seat_result.outcomes:
+            if outcome == Outcome.PUSH:
+                self.pushes += 1
+            elif outcome == Outcome.WIN:
+                self.wins += 1
+            elif outcome == Outcome.BLACKJACK:
+                self.wins += 1
+                self.blackjacks += 1
+            else:
+                self.losses += 1
+                if outcome == Outcome.SURRENDER:
+                    self.surrenders += 1
+
+    def merge(self, other):
+        self.rounds += other.rounds
+        self.bets += other.bets
+        self.hands += other.hands
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.blackjacks += other.blackjacks
+        self.surrenders += other.surrenders
+        self.net_units += other.net_units
+        self.elapsed += other.elapsed
+        if other.stats is not None:
+            if self.stats is None:
+                self.stats = OutcomeStatistics(other.stats.confidence)
+            self.stats.merge(other.stats)
+        return self
+
+    @property
+    def house_edge(self):
+        """Expected player loss per initial bet"""
+        return -self.net_units / self.bets if self.bets else 0.0
+
+    @property
+    def rounds_per_second(self):
+        return self.rounds / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        surrenders = f", surrenders: {self.surrenders}" if self.surrenders else ""
+        return (f"{self.rounds} rounds ({self.hands} hands) in {self.elapsed:.2f}s "
+                f"= {self.rounds_per_second:,.0f} rounds/s\n"
+                f"W/L/P: {self.wins}/{self.losses}/{self.pushes}, "
+                f"blackjacks: {self.blackjacks}{surrenders}\n"
+                f"Net: {self.net_units:+.1f} units, house edge: {self.house_edge:.4%}"
+                + (f"\n{self.stats}" if self.stats is not None else ""))
+
+
+class Simulator:
+    """Plays rounds of game.Game without any GUI, driven by a player policy.
+
+    A policy is a callable ``policy(player, dealer_upcard)`` returning one of
+    "hit", "stand", "double", "split" or "surrender". Illegal doubles,
+    splits and surrenders are treated as a hit.
+    """
+
+    def __init__(self, policy=dealer_policy, game=None, seats=1):
+        self.policy = policy
+        self.game = game or Game(num_slots=seats)
+        for seat_index in range(seats):
+            self.game.sit_down(seat_index, f"Sim {seat_index + 1}")
+
+    def play_round(self, result):
+        game = self.game
+
+        game.new_round()
+        upcard = game.dealer.hand[1]  # hand[0] is the hidden hole card
+
+        while game.in_round:
+            seat = game.turn
+            player = game.slots[seat]
+            action = legal_action(player, self.policy(player, upcard))
+            if action == "stand":
+                game.player_stand(seat)
+            elif action == "double":
+                game.player_double(seat)
+            elif action == "split":
+                game.player_split(seat)
+            elif action == "surrender":
+                game.player_surrender(seat)
+            else:
+                game.player_hit(seat)
+
+        for seat_result in game.results.values():
+            result.add(seat_result, upcard)
+        result.rounds += 1
+
+    def run(self, rounds, result=None, target_width=None, check_every=10_000):
+        """Play ``rounds`` rounds. With ``target_width`` stop early, checking
+        every ``check_every`` rounds, once the house edge confidence interval
+        is that narrow (see OutcomeStatistics.converged)."""
+        result = result or SimulationResult()
+        start = time.perf_counter()
+        if target_width is None:
+            for _ in range(rounds):
+                self.play_round(result)
+        else:
+            if result.stats is None:
+                result.stats = OutcomeStatistics()
+            played = 0
+            while played < rounds and not result.stats.converged(target_width):
+                batch = min(check_every, rounds - played)
+                for _ in range(batch):
+                    self.play_round(result)
+                played += batch
+        result.elapsed += time.perf_counter() - start
+        return result
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless blackjack simulation")
+    parser.add_argument("rounds", type=int, nargs="?", default=100_000)
+    parser.add_argument("--seats", type=int, default=1, help="occupied seats (1-7)")
+    parser.add_argument("--policy", choices=("dealer", "basic"), default="dealer",
+                        help="dealer mimic or the persisted basic-strategy table")
+    parser.add_argument("--numpy-shoe", action="store_true",
+                        help="use the array-backed entities.ArrayDeck shoe")
+    parser.add_argument("--penetration", type=float, default=None,
+                        help="fraction of the shoe dealt before the cut card")
+    parser.add_argument("--lazy", action="store_true",
+                        help="shuffle one card per draw instead of the whole shoe")
+    parser.add_argument("--csm", action="store_true",
+                        help="continuous shuffling machine")
+    parser.add_argument("--metrics", action="store_true",
+                        help="print per-operation latencies (see game.Metrics)")
+    parser.add_argument("--hands", metavar="PATH", default=None,
+                        help="record every hand into a simulation.HandStore at PATH")
+    parser.add_argument("--bankroll", type=float, default=None, metavar="UNITS",
+                        help="with --hands, the risk of ruin of a bankroll over the stored rounds")
+    parser.add_argument("--stats", action="store_true",
+                        help="confidence interval and per-up-card breakdown of the EV")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--target-width", type=float, default=None,
+                        help="stop once the house edge interval is this wide (e.g. 0.002)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    rules = from_args(args)
+    if args.bankroll is not None and not args.hands:
+        parser.error("--bankroll needs --hands")
+    if args.numpy_shoe:
+        from entities.ArrayDeck import ArrayDeck
+        try:
+            deck = ArrayDeck(num_decks=rules.num_decks, lazy=args.lazy,
+                             penetration=args.penetration, continuous=args.csm)
+        except ValueError as exc:
+            parser.error(str(exc))
+    else:
+        deck = Deck(num_decks=rules.num_decks, lazy=args.lazy, penetration=args.penetration,
+                    continuous=args.csm)
+    store = None
+    if args.hands:
+        from simulation.HandStore import HandStore
+        store = HandStore(args.hands)
+    game = Game(num_slots=args.seats, deck=deck, event_log=store, rules=rules)
+    policy = dealer_policy
+    if args.policy == "basic":
+        from strategy.StrategyTable import TablePolicy
+        policy = TablePolicy(rules)
+    metrics = None
+    if args.metrics:
+        from game.Metrics import instrument
+        metrics = instrument(game)
+    stats = None
+    if args.stats or args.target_width is not None:
+        stats = OutcomeStatistics(args.confidence)
+    simulator = Simulator(policy=policy, game=game, seats=args.seats)
+    print(simulator.run(args.rounds, SimulationResult(stats), args.target_width))
+    if store is not None:
+        store.close()
+        print(f"{store.rows} hands in {args.hands}")
+        if args.bankroll is not None:
+            from simulation.BatchSettlement import risk_summary, round_nets
+            from simulation.HandStore import read_hands
+            risk = risk_summary(args.bankroll, round_nets(read_hands(args.hands)))
+            print(f"Bankroll {args.bankroll:g}: final {risk['final']:.1f}, "
+                  f"max drawdown {risk['max_drawdown']:.1f}, "
+                  f"{'ruined' if risk['ruined'] else 'never ruined'}")
+    if metrics is not None:
+        print(metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import math
+from statistics import NormalDist
+
+from strategy.DealerProbabilities import NUM_POINT_RANKS, point_rank
+
+UPCARD_LABELS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10")
+
+
+class RunningStats:
+    """Count, mean and variance of a stream of numbers in constant memory
+    (Welford's online algorithm); two tallies combine exactly with merge"""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other):
+        """Fold in another tally as if its values had been added here"""
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self):
+        """Standard error of the mean"""
+        return math.sqrt(self.variance / self.count) if self.count else math.inf
+
+    def interval(self, confidence=0.95):
+        """Normal-approximation confidence interval for the mean"""
+        half = _z(confidence) * self.stderr
+        return self.mean - half, self.mean + half
+
+
+class OutcomeStatistics:
+    """Streaming tally of each seat's net win per round, overall and per
+    dealer up-card, for a confidence interval on the house edge.
+
+    A seat's net folds in its doubles and split hands, so the mean is the
+    EV per hand dealt in initial-bet units and the house edge its negation,
+    as in SimulationResult. Memory does not grow with the number of rounds.
+    """
+
+    def __init__(self, confidence=0.95):
+        self.confidence = confidence
+        self.net = RunningStats()
+        self.by_upcard = [RunningStats() for _ in range(NUM_POINT_RANKS)]
+
+    def add(self, net, upcard):
+        """Count one seat's net against a dealer up-card Card"""
+        self.net.add(net)
+        self.by_upcard[point_rank(upcard)].add(net)
+
+    def merge(self, other):
+        self.net.merge(other.net)
+        for mine, theirs in zip(self.by_upcard, other.by_upcard):
+            mine.merge(theirs)
+        return self
+
+    @property
+    def house_edge(self):
+        return -self.net.mean
+
+    def house_edge_interval(self):
+        low, high = self.net.interval(self.confidence)
+        return -high, -low
+
+    @property
+    def interval_width(self):
+        """Full width of the house edge confidence interval"""
+        return 2 * _z(self.confidence) * self.net.stderr
+
+    def converged(self, target_width, min_hands=1000):
+        """Whether the house edge interval is narrower than ``target_width``"""
+        return self.net.count >= min_hands and self.interval_width <= target_width
+
+    def __str__(self):
+        low, high = self.house_edge_interval()
+        lines = [f"House edge: {self.house_edge:.4%} "
+                 f"({self.confidence:.0%} CI {low:.4%} .. {high:.4%}, "
+                 f"sd {self.net.stddev:.3f} over {self.net.count} hands)",
+                 "up      hands         EV    +/-"]
+        z = _z(self.confidence)
+        for label, stats in zip(UPCARD_LABELS, self.by_upcard):
+            if stats.count:
+                lines.append(f"{label:>2} {stats.count:>10} {stats.mean:>+10.4f} "
+                             f"{z * stats.stderr:>6.4f}")
+        return "\n".join(lines)
+
+
+def _z(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
@@ -0,0 +1,194 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+from multiprocessing import Pool
+
+from entities.Deck import Deck
+from game.Game import Game
+from game.Rules import Rules
+from simulation.Simulator import SimulationResult, Simulator, dealer_policy
+from simulation.Statistics import OutcomeStatistics
+
+# Part of every cell's configuration: bump it when the engine changes in a
+# way that makes earlier cell results stale, so they are run again
+FORMAT = 1
+POLICIES = ("dealer", "basic")
+
+
+def grid(decks=(5,), penetrations=(None,), variants=("s17-das-2h",), policies=("dealer",),
+         rounds=1_000_000, seed=0, target_width=None, confidence=0.95):
+    """Configuration of every cell of a sweep, in a stable order.
+
+    ``variants`` are game.Rules.Rules codes without the deck count (e.g.
+    "h17-das-4h-ls"); a penetration of None is the shoe's default cut card.
+    """
+    for num_decks, penetration, variant, policy in itertools.product(
+            decks, penetrations, variants, policies):
+        yield {
+            "format": FORMAT,
+            "rules": Rules.from_code(f"{num_decks}d-{variant}").code,
+            "penetration": penetration,
+            "policy": policy,
+            "rounds": rounds,
+            "seed": seed,
+            "target_width": target_width,
+            "confidence": confidence,
+        }
+
+
+def cell_key(config):
+    """Stable hash of a cell's configuration, seed included"""
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:20]
+
+
+def run_cell(config):
+    """Simulate one cell (runs in a worker); returns (config, summary)"""
+    rules = Rules.from_code(config["rules"])
+    deck = Deck(num_decks=rules.num_decks, rng=random.Random(cell_key(config)),
+                penetration=config["penetration"])
+    game = Game(num_slots=1, deck=deck, rules=rules)
+    if config["policy"] == "basic":
+        from strategy.StrategyTable import TablePolicy
+        policy = TablePolicy(rules)
+    else:
+        policy = dealer_policy
+    result = SimulationResult(OutcomeStatistics(config["confidence"]))
+    Simulator(policy=policy, game=game).run(config["rounds"], result, config["target_width"])
+    return config, summary(result)
+
+
+def summary(result):
+    """JSON-ready figures of a SimulationResult with statistics"""
+    low, high = result.stats.house_edge_interval()
+    return {
+        "rounds": result.rounds,
+        "bets": result.bets,
+        "hands": result.hands,
+        "wins": result.wins,
+        "losses": result.losses,
+        "pushes": result.pushes,
+        "blackjacks": result.blackjacks,
+        "surrenders": result.surrenders,
+        "net_units": result.net_units,
+        "house_edge": result.house_edge,
+        "interval": [low, high],
+        "elapsed": result.elapsed,
+    }
+
+
+class Sweep:
+    """Runs the cells of a grid across a process pool, keeping each
+    finished cell as ``<directory>/<cell_key>.json``.
+
+    A cell file is written to a temporary name and renamed into place, so
+    it either holds a complete result or does not exist. Cells that
+    already have a file are skipped; rerunning an interrupted sweep thus
+    picks up where it stopped, and changing the grid only runs new cells.
+    """
+
+    def __init__(self, directory, workers=None):
+        self.directory = directory
+        self.workers = workers or os.cpu_count() or 1
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, config):
+        return os.path.join(self.directory, cell_key(config) + ".json")
+
+    def pending(self, configs):
+        return [config for config in configs if not os.path.exists(self.path(config))]
+
+    def run(self, configs, progress=None):
+        """Run every pending cell, calling ``progress(config, summary)`` as
+        each finishes, and return ``results(configs)``"""
+        configs = list(configs)
+        todo = self.pending(configs)
+        if todo:
+            basic = {config["rules"] for config in todo if config["policy"] == "basic"}
+            if basic:
+                from strategy.StrategyTable import StrategyTable
+                for code in basic:  # persist the tables once, before forking workers
+                    StrategyTable.load_or_solve(rules=Rules.from_code(code))
+            with Pool(processes=min(self.workers, len(todo))) as pool:
+                for config, cell in pool.imap_unordered(run_cell, todo):
+                    self._save(config, cell)
+                    if progress is not None:
+                        progress(config, cell)
+        return self.results(configs)
+
+    def _save(self, config, cell):
+        path = self.path(config)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"config": config, "result": cell}, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+
+    def results(self, configs):
+        """(config, summary or None if not run yet) for every cell"""
+        results = []
+        for config in configs:
+            try:
+                with open(self.path(config)) as f:
+                    results.append((config, json.load(f)["result"]))
+            except FileNotFoundError:
+                results.append((config, None))
+        return results
+
+
+def describe_cell(config, cell):
+    penetration = "default" if config["penetration"] is None else f"{config['penetration']:.0%}"
+    label = f"{config['rules']:<20} {penetration:>7} {config['policy']:<6}"
+    if cell is None:
+        return label + " (not run)"
+    low, high = cell["interval"]
+    return (f"{label} {cell['rounds']:>11,} rounds  house edge {cell['house_edge']:+.4%} "
+            f"+/- {(high - low) / 2:.4%}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resumable sweep over house rules and policies")
+    parser.add_argument("directory", help="where finished cells are kept")
+    parser.add_argument("--decks", type=int, nargs="+", default=[5])
+    parser.add_argument("--penetration", type=float, nargs="+", default=[None],
+                        help="fractions of the shoe dealt before the cut card")
+    parser.add_argument("--variants", nargs="+", default=["s17-das-2h"],
+                        help='rule codes without the deck count, e.g. "h17-das-4h-ls"')
+    parser.add_argument("--policies", nargs="+", choices=POLICIES, default=["dealer"])
+    parser.add_argument("--rounds", type=int, default=1_000_000,
+                        help="rounds per cell (a cap with --target-width)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target-width", type=float, default=None,
+                        help="stop a cell once its house edge interval is this wide")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    configs = list(grid(args.decks, args.penetration, args.variants, args.policies,
+                        args.rounds, args.seed, args.target_width, args.confidence))
+    sweep = Sweep(args.directory, args.workers)
+    todo = len(sweep.pending(configs))
+    print(f"{len(configs)} cells, {len(configs) - todo} already done")
+    done = 0
+
+    def progress(config, cell):
+        nonlocal done
+        done += 1
+        print(f"[{done}/{todo}] {describe_cell(config, cell)}", flush=True)
+
+    try:
+        results = sweep.run(configs, progress)
+    except KeyboardInterrupt:
+        print("Interrupted; finished cells are kept, run again to resume")
+        raise SystemExit(1)
+    print()
+    for config, cell in results:
+        print(describe_cell(config, cell))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import time
+from collections import namedtuple
+
+from game.Rules import Rules
+
+# Shoe compositions are 10-tuples of remaining card counts indexed by point
+# rank: 0 = ace, 1..8 = "2".."9", 9 = any ten-valued card.
+NUM_POINT_RANKS = 10
+
+# Packed compositions (see pack) use BITS per point rank, enough for 63 decks
+BITS = 10
+MASK = (1 << BITS) - 1
+ONE = tuple(1 << (BITS * rank) for rank in range(NUM_POINT_RANKS))
+
+CacheInfo = namedtuple("CacheInfo", ("hits", "misses", "maxsize", "currsize"))
+
+# Dealer final outcomes, in the order of the probability tuples returned below
+OUTCOMES = (17, 18, 19, 20, 21, "bust", "blackjack")
+BUST = OUTCOMES.index("bust")
+BLACKJACK = OUTCOMES.index("blackjack")
+
+
+def point_rank(card):
+    """Composition index of a card (0 for an ace, value - 1 otherwise)"""
+    return 0 if card.is_ace else card.value - 1
+
+
+def composition_from_cards(cards):
+    counts = [0] * NUM_POINT_RANKS
+    for card in cards:
+        counts[point_rank(card)] += 1
+    return tuple(counts)
+
+
+def full_shoe(num_decks):
+    """Composition of a fresh shoe of ``num_decks`` decks"""
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+
+class DealerProbabilities:
+    """Exact distribution of the dealer's final total for Game.dealer_play.
+
+    The dealer draws by the game.Rules.Rules ``rules`` (by default to 17,
+    standing on every 17); a two-card 21 is reported as blackjack. Results
+    are memoised per (total, ace, composition) state, each packed into one
+    int (see pack) so the memo is a plain dict the garbage collector never
+    has to walk; it is emptied when it reaches ``cache_size`` entries
+    (never with None, for callers that clear_cache themselves).
+    """
+
+    def __init__(self, cache_size=1 << 16, rules=None):
+        self.cache_size = cache_size
+        self.rules = rules or Rules()
+        self._dealer_hits = self.rules.dealer_hits
+        self._deadline = float("inf")
+        self._memo = {}
+        self._hits = self._misses = 0
+
+    def distribution(self, upcard, composition, deadline=None):
+        """Probabilities of OUTCOMES for a dealer showing ``upcard``.
+
+        ``upcard`` is a point rank (see point_rank) and ``composition`` the
+        unseen cards the hole card and draws come from, upcard excluded.
+        Raises TimeoutError once past ``deadline`` (a perf_counter time);
+        what was computed until then stays memoised.
+        """
+        return self.packed_distribution(upcard, pack(composition), sum(composition), deadline)
+
+    def packed_distribution(self, upcard, key, total_cards, deadline=None):
+        """distribution() for a composition already packed into ``key``"""
+        self._deadline = deadline if deadline is not None else float("inf")
+        result = [0.0] * len(OUTCOMES)
+        for rank in range(NUM_POINT_RANKS):
+            count = (key >> (BITS * rank)) & MASK
+            if not count:
+                continue
+            p = count / total_cards
+            if (upcard == 0 and rank == 9) or (upcard == 9 and rank == 0):
+                result[BLACKJACK] += p
+                continue
+            sub = self._final(upcard + rank + 2, upcard == 0 or rank == 0,
+                              key - ONE[rank], total_cards - 1)
+            for i, q in enumerate(sub):
+                result[i] += p * q
+        return tuple(result)
+
+    def _final(self, hard, has_ace, key, total_cards):
+        if not self._dealer_hits[hard][has_ace]:
+            best = hard + 10 if has_ace and hard <= 11 else hard
+            return _STOOD[min(best, 22) - 17]
+
+        state = key << 6 | hard << 1 | has_ace
+        result = self._memo.get(state)
+        if result is not None:
+            self._hits += 1
+            return result
+        self._misses += 1
+        if time.perf_counter() > self._deadline:
+            raise TimeoutError("dealer distribution past its deadline")
+
+        result = [0.0] * len(OUTCOMES)
+        for rank in range(NUM_POINT_RANKS):
+            count = (key >> (BITS * rank)) & MASK
+            if not count:
+                continue
+            p = count / total_cards
+            sub = self._final(hard + rank + 1, has_ace or rank == 0,
+                              key - ONE[rank], total_cards - 1)
+            for i, q in enumerate(sub):
+                result[i] += p * q
+        result = tuple(result)
+        if self.cache_size is not None and len(self._memo) >= self.cache_size:
+            self._memo.clear()
+        self._memo[state] = result
+        return result
+
+    def cache_info(self):
+        return CacheInfo(self._hits, self._misses, self.cache_size, len(self._memo))
+
+    def clear_cache(self):
+        self._memo.clear()
+
+
+def pack(composition):
+    """Composition as one int, BITS per point rank: taking out a card of
+    ``rank`` is ``key - ONE[rank]``, and the key is hashable as it is.
+    Raises ValueError for a count that does not fit (over 63 decks)."""
+    key = 0
+    for rank, count in enumerate(composition):
+        if not 0 <= count <= MASK:
+            raise ValueError(f"{count} cards of one point rank do not fit in {BITS} bits")
+        key += count << (BITS * rank)
+    return key
+
+
+def unpack(key):
+    return tuple((key >> (BITS * rank)) & MASK for rank in range(NUM_POINT_RANKS))
+
+
+# Final outcome once the dealer stands on 17..21 or busts (22 and over)
+_STOOD = tuple(tuple(float(i == outcome) for i in range(len(OUTCOMES)))
+               for outcome in (0, 1, 2, 3, 4, BUST))
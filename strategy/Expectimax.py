@@ -0,0 +1,227 @@
+import time
+from collections import namedtuple
+
+from strategy.DealerProbabilities import (
+    BITS, BLACKJACK, BUST, MASK, NUM_POINT_RANKS, ONE, DealerProbabilities, pack, point_rank,
+    unpack,
+)
+from strategy.StrategyTable import ACTIONS, StrategyTable, is_pair
+
+# action: name to play; evs: action -> EV per unit of the hand's initial
+# stake; depth: player draws taken out of the shoe before the dealer's odds
+# were computed, None when the search ran out of time and the table
+# answered; exact: every draw was taken out
+Advice = namedtuple("Advice", ("action", "evs", "depth", "exact", "elapsed"))
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class Expectimax:
+    """Advice for a live seat from an expectimax search over the cards the
+    player has not seen: the rest of the shoe plus the dealer's hole card.
+    Compositions are packed ints (see DealerProbabilities.pack), so a
+    branch takes its card out with one subtraction and never copies the
+    parent state, and every state is directly a memo key.
+
+    The rules are those of the ``table`` (see StrategyTable), by default the
+    game.Rules.Rules defaults; a dealer blackjack takes every stake. The
+    player's draws are always taken from the exact unseen composition; the
+    dealer's final total is computed on the composition left after the
+    first ``depth`` of them, deeper ones reuse that. ``advise`` deepens one
+    draw at a time until the search is exact or ``budget`` seconds are
+    spent, and falls back to the ``table`` answer if not even depth 0
+    finishes. Player nodes and dealer distributions are memoised across
+    calls, so asking again in the same spot goes deeper. Splits are valued
+    as twice one split hand, ignoring the cards the other hand draws.
+    """
+
+    def __init__(self, table=None, budget=0.05, cache_size=1 << 17, rules=None):
+        self.table = table or StrategyTable.load_or_solve(rules=rules)
+        self.rules = self.table.rules
+        self.budget = budget
+        self.cache_size = cache_size
+        self.dealer = DealerProbabilities(cache_size=None, rules=self.rules)  # see _trim
+        self._optimal = {}
+        self._dealer = {}
+        self._deadline = None
+        self._truncated = False  # some draw was left in the dealer's composition
+
+    def advise(self, game, seat_index):
+        """Advice for the seat's active hand, or None if it is not its turn"""
+        player = game.slots[seat_index]
+        if not game.in_round or game.turn != seat_index or not player:
+            return None
+        hand = player.get_current_hand()
+        upcard = game.dealer.hand[1]
+        can_double, can_split = player.can_double(), player.can_split()
+        can_surrender = player.can_surrender()
+
+        start = time.perf_counter()
+        deadline = start + self.budget
+        self._trim()
+        unseen = _unseen(game)
+        evs = searched = None
+        exact = False
+        depth = 0
+        while unseen is not None and not exact:
+            try:
+                evs = self.evaluate(hand, upcard, unseen, can_double, can_split, depth, deadline,
+                                    can_surrender)
+            except _OutOfTime:
+                break
+            searched, exact = depth, not self._truncated
+            depth += 1
+
+        if evs is None:
+            action = self.table.best_action(hand, upcard, can_double, can_split, can_surrender)
+            evs = self.table.hand_evs(hand, upcard, can_double, can_split, can_surrender)
+        else:
+            action = max(evs, key=evs.get)
+        return Advice(action, evs, searched, exact, time.perf_counter() - start)
+
+    def evaluate(self, hand, upcard, unseen, can_double=True, can_split=False,
+                 depth=NUM_POINT_RANKS * 4, deadline=None, can_surrender=False):
+        """EV of every legal action for ``hand`` against the dealer ``upcard``
+        Card, with ``unseen`` the point-rank composition the rest is drawn
+        from. Raises _OutOfTime past ``deadline`` (a perf_counter time)."""
+        if deadline is None:
+            self._trim()
+        self._deadline = deadline if deadline is not None else float("inf")
+        self._truncated = False
+        up = point_rank(upcard)
+        key, cards = pack(unseen), sum(unseen)
+        hard = hand.hard
+        has_ace = hand.aces > 0
+
+        evs = {"stand": self._stand(_best(hard, has_ace), up, key)}
+        if can_double:
+            evs["double"] = self._double(hard, has_ace, up, key, cards, key, depth)
+        if can_split and is_pair(hand):
+            evs["split"] = self._split(point_rank(hand[0]), up, key, cards, depth)
+        evs["hit"] = self._hit(hard, has_ace, up, key, cards, key, depth)
+        if can_surrender:
+            blackjack = self._outcomes(up, key)[BLACKJACK]
+            evs["surrender"] = -0.5 * (1 - blackjack) - blackjack
+        return {action: evs[action] for action in ACTIONS if action in evs}
+
+    def _trim(self):
+        """Empty the memos once they outgrow ``cache_size``. Freeing that many
+        entries takes milliseconds, so advise does it up front, inside its
+        budget, never in the middle of a timed search."""
+        if (len(self._optimal) + len(self._dealer) > self.cache_size
+                or self.dealer.cache_info().currsize > self.cache_size // 2):
+            self._optimal.clear()
+            self._dealer.clear()
+            self.dealer.clear_cache()
+
+    def _after_draw(self, rest, dealer_key, depth):
+        """Dealer composition and depth left once the player drew a card"""
+        if depth:
+            return rest, depth - 1
+        self._truncated = True
+        return dealer_key, 0
+
+    def _outcomes(self, up, dealer_key):
+        outcomes = self._dealer.get((up, dealer_key))
+        if outcomes is None:
+            if time.perf_counter() > self._deadline:
+                raise _OutOfTime
+            try:
+                outcomes = self.dealer.distribution(up, unpack(dealer_key), self._deadline)
+            except TimeoutError:
+                raise _OutOfTime from None
+            self._dealer[up, dealer_key] = outcomes
+        return outcomes
+
+    def _stand(self, total, up, dealer_key):
+        if total > 21:
+            return -1.0
+        outcomes = self._outcomes(up, dealer_key)
+        ev = outcomes[BUST] - outcomes[BLACKJACK]
+        for dealer_total, p in zip(range(17, 22), outcomes):
+            if total > dealer_total:
+                ev += p
+            elif total < dealer_total:
+                ev -= p
+        return ev
+
+    def _hit(self, hard, has_ace, up, key, cards, dealer_key, depth):
+        ev = 0.0
+        for rank in range(NUM_POINT_RANKS):
+            count = (key >> (BITS * rank)) & MASK
+            if not count:
+                continue
+            p = count / cards
+            new_hard = hard + rank + 1
+            if new_hard > 21:
+                ev -= p
+            else:
+                rest = key - ONE[rank]
+                ev += p * self._optimal_ev(new_hard, has_ace or rank == 0, up, rest, cards - 1,
+                                           *self._after_draw(rest, dealer_key, depth))
+        return ev
+
+    def _optimal_ev(self, hard, has_ace, up, key, cards, dealer_key, depth):
+        """EV of the better of hit and stand, with no more doubles or splits"""
+        node = (hard, has_ace, up, key, dealer_key, depth)
+        memo = self._optimal.get(node)
+        if memo is not None:
+            ev, truncated = memo
+            self._truncated |= truncated
+            return ev
+        if time.perf_counter() > self._deadline:
+            raise _OutOfTime
+
+        outer, self._truncated = self._truncated, False
+        total = _best(hard, has_ace)
+        ev = self._stand(total, up, dealer_key)
+        if total < 21:
+            ev = max(ev, self._hit(hard, has_ace, up, key, cards, dealer_key, depth))
+        self._optimal[node] = ev, self._truncated
+        self._truncated |= outer
+        return ev
+
+    def _double(self, hard, has_ace, up, key, cards, dealer_key, depth):
+        ev = 0.0
+        for rank in range(NUM_POINT_RANKS):
+            count = (key >> (BITS * rank)) & MASK
+            if count:
+                dealer_after, _ = self._after_draw(key - ONE[rank], dealer_key, depth)
+                ev += count / cards * self._stand(_best(hard + rank + 1, has_ace or rank == 0),
+                                                  up, dealer_after)
+        return 2 * ev
+
+    def _split(self, rank, up, key, cards, depth):
+        """Twice the EV of one hand starting from one card of ``rank``"""
+        ev = 0.0
+        for second in range(NUM_POINT_RANKS):
+            count = (key >> (BITS * second)) & MASK
+            if not count:
+                continue
+            hard = rank + second + 2
+            has_ace = rank == 0 or second == 0
+            rest = key - ONE[second]
+            dealer_key, left = self._after_draw(rest, key, depth)
+            best = max(self._stand(_best(hard, has_ace), up, dealer_key),
+                       self._hit(hard, has_ace, up, rest, cards - 1, dealer_key, left))
+            if self.rules.double_after_split:
+                best = max(best, self._double(hard, has_ace, up, rest, cards - 1, dealer_key, left))
+            ev += count / cards * best
+        return 2 * ev
+
+
+def _unseen(game):
+    """Point-rank composition of the shoe plus the hole card, or None if
+    the shoe does not expose one (e.g. a remote table)"""
+    composition = getattr(game.deck, "composition", None)
+    if composition is None:
+        return None
+    unseen = list(composition())
+    unseen[point_rank(game.dealer.hand[0])] += 1
+    return unseen
+
+
+def _best(hard, has_ace):
+    return hard + 10 if has_ace and hard <= 11 else hard
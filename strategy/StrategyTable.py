@@ -0,0 +1,283 @@
+import mmap
+import os
+import struct
+from array import array
+
+from game.Rules import Rules
+from strategy.DealerProbabilities import (
+    BLACKJACK, BUST, NUM_POINT_RANKS, DealerProbabilities, full_shoe, point_rank,
+)
+
+ACTIONS = ("hit", "stand", "double", "split", "surrender")
+HIT, STAND, DOUBLE, SPLIT, SURRENDER = range(len(ACTIONS))
+
+# Table rows: hard totals 4-21, soft totals 12-21, then pairs by point rank
+HARD_ROW = 0
+SOFT_ROW = HARD_ROW + 18
+PAIR_ROW = SOFT_ROW + 10
+NUM_ROWS = PAIR_ROW + NUM_POINT_RANKS
+
+# File layout: header, then int16 EVs in row, up-card, action order
+MAGIC = b"BJST"
+VERSION = 2
+# magic, version, rows, up-cards, actions, then the Rules.key the table was solved for
+HEADER = struct.Struct("<4sHHHHB??B?")
+SCALE = 10000  # EVs are stored as fixed point, in 1/10000 of a unit
+MISSING = -32768
+SIZE = NUM_ROWS * NUM_POINT_RANKS * len(ACTIONS)  # EVs in a table
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "basic_strategy.bjs")
+
+
+class StrategyTable:
+    """Expected values of each action per (hand, dealer up-card).
+
+    A table is solved for one game.Rules.Rules: the dealer's soft 17,
+    doubling after a split and surrender follow them, and a dealer
+    blackjack (checked after the players act) takes every stake on the
+    table, a surrendered one included. Resplits are valued as a single
+    split. A player blackjack pays 3:2 and is never a decision.
+    """
+
+    def __init__(self, values, rules=None):
+        self.values = values  # flat int16 sequence, array or mmap-backed memoryview
+        self.rules = rules or Rules()
+
+    @classmethod
+    def solve(cls, rules=None):
+        """Compute the table for a fresh shoe under ``rules``.
+
+        The dealer's outcomes are exact for the shoe minus the up-card; the
+        player's draws use that same composition without further removal.
+        """
+        rules = rules or Rules()
+        dealer = DealerProbabilities(rules=rules)
+        values = array("h", [MISSING]) * SIZE
+        for up in range(NUM_POINT_RANKS):
+            composition = list(full_shoe(rules.num_decks))
+            composition[up] -= 1
+            solver = _HandSolver(composition, dealer.distribution(up, tuple(composition)), rules)
+            for row, hard, has_ace, pair in _rows():
+                evs = solver.action_evs(hard, has_ace, pair)
+                for action, ev in enumerate(evs):
+                    if ev is not None:
+                        values[_offset(row, up, action)] = round(ev * SCALE)
+        return cls(values, rules)
+
+    def save(self, path=DEFAULT_PATH):
+        """Write the table to a temporary file renamed into place, so an
+        interrupted save never leaves a truncated table at ``path``"""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, NUM_ROWS, NUM_POINT_RANKS, len(ACTIONS),
+                                *self.rules.key))
+            f.write(array("h", self.values).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, rules=None):
+        """Memory-map a table written by save(); with ``rules`` it must have
+        been solved for them. Raises ValueError for any other or truncated
+        file."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # ValueError if empty
+        try:
+            magic, version, rows, ups, actions, *key = HEADER.unpack_from(mapped)
+        except struct.error:
+            magic = version = rows = ups = actions = None
+        table_rules = Rules(*key) if (magic, version) == (MAGIC, VERSION) else None
+        if ((rows, ups, actions) != (NUM_ROWS, NUM_POINT_RANKS, len(ACTIONS))
+                or len(mapped) != HEADER.size + 2 * SIZE
+                or table_rules is None or (rules is not None and rules != table_rules)):
+            mapped.close()
+            raise ValueError(f"{path} is not a compatible strategy table")
+        return cls(memoryview(mapped)[HEADER.size:].cast("h"), table_rules)
+
+    @classmethod
+    def load_or_solve(cls, path=None, rules=None):
+        """Load the persisted table for ``rules``, solving and saving it
+        first if missing"""
+        rules = rules or Rules()
+        path = path or table_path(rules)
+        try:
+            return cls.load(path, rules)
+        except (FileNotFoundError, ValueError):
+            table = cls.solve(rules)
+            table.save(path)
+            return cls.load(path, rules)
+
+    def ev(self, row, up, action):
+        """EV of an action in initial-bet units, or None if not applicable"""
+        value = self.values[_offset(row, up, action)]
+        return None if value == MISSING else value / SCALE
+
+    def best_action(self, hand, upcard, can_double=True, can_split=False, can_surrender=False):
+        """Best legal action name for a Hand against a dealer up-card Card"""
+        base = _offset(_row(hand, can_split), point_rank(upcard), 0)
+        best = STAND
+        for action in (HIT, DOUBLE, SPLIT, SURRENDER):
+            if ((action == DOUBLE and not can_double) or (action == SPLIT and not can_split)
+                    or (action == SURRENDER and not can_surrender)):
+                continue
+            if self.values[base + action] > self.values[base + best]:
+                best = action
+        return ACTIONS[best]
+
+    def hand_evs(self, hand, upcard, can_double=True, can_split=False, can_surrender=False):
+        """EV of every legal action for a Hand, keyed by action name"""
+        row, up = _row(hand, can_split), point_rank(upcard)
+        evs = {}
+        for action, name in enumerate(ACTIONS):
+            if ((action == DOUBLE and not can_double) or (action == SPLIT and not can_split)
+                    or (action == SURRENDER and not can_surrender)):
+                continue
+            ev = self.ev(row, up, action)
+            if ev is not None:
+                evs[name] = ev
+        return evs
+
+    def advise(self, player, upcard):
+        """Best action for the player's currently active hand"""
+        return self.best_action(player.get_current_hand(), upcard, player.can_double(),
+                                player.can_split(), player.can_surrender())
+
+
+def table_path(rules):
+    """Where load_or_solve keeps the table for ``rules``"""
+    if rules == Rules():
+        return DEFAULT_PATH
+    return os.path.join(os.path.dirname(DEFAULT_PATH), f"basic_strategy-{rules.code}.bjs")
+
+
+_default_table = None
+
+
+def basic_strategy_policy(player, dealer_upcard):
+    """Simulator policy playing the persisted basic-strategy table"""
+    global _default_table
+    if _default_table is None:
+        _default_table = StrategyTable.load_or_solve()
+    return _default_table.advise(player, dealer_upcard)
+
+
+class TablePolicy:
+    """basic_strategy_policy for other house rules. Picklable for worker
+    processes: each one loads the persisted table on first use."""
+
+    def __init__(self, rules=None):
+        self.rules = rules or Rules()
+        self._table = None
+
+    def __call__(self, player, dealer_upcard):
+        if self._table is None:
+            self._table = StrategyTable.load_or_solve(rules=self.rules)
+        return self._table.advise(player, dealer_upcard)
+
+    def __getstate__(self):
+        return {"rules": self.rules, "_table": None}
+
+
+class _HandSolver:
+    """EVs of player hands against one dealer up-card distribution"""
+
+    def __init__(self, composition, dealer_outcomes, rules):
+        total = sum(composition)
+        self.draws = [(rank, count / total) for rank, count in enumerate(composition) if count]
+        self.dealer = dealer_outcomes
+        self.rules = rules
+        self._stand = {}
+        self._optimal = {}
+
+    def stand(self, total):
+        if total > 21:
+            return -1.0
+        if total not in self._stand:
+            ev = self.dealer[BUST] - self.dealer[BLACKJACK]
+            for dealer_total, p in zip(range(17, 22), self.dealer):
+                if total > dealer_total:
+                    ev += p
+                elif total < dealer_total:
+                    ev -= p
+            self._stand[total] = ev
+        return self._stand[total]
+
+    def hit(self, hard, has_ace):
+        ev = 0.0
+        for rank, p in self.draws:
+            new_hard = hard + rank + 1
+            ev += p * (-1.0 if new_hard > 21 else self.optimal(new_hard, has_ace or rank == 0))
+        return ev
+
+    def double(self, hard, has_ace):
+        ev = 0.0
+        for rank, p in self.draws:
+            ev += p * self.stand(_best(hard + rank + 1, has_ace or rank == 0))
+        return 2 * ev
+
+    def optimal(self, hard, has_ace):
+        """EV of the best of hit and stand, with no more doubles or splits"""
+        key = (hard, has_ace)
+        if key not in self._optimal:
+            self._optimal[key] = max(self.stand(_best(hard, has_ace)), self.hit(hard, has_ace))
+        return self._optimal[key]
+
+    def split(self, rank):
+        """Two hands each starting from one card of ``rank``; doubling
+        allowed if the rules double after a split"""
+        das = self.rules.double_after_split
+        ev = 0.0
+        for second, p in self.draws:
+            hard = rank + second + 2
+            has_ace = rank == 0 or second == 0
+            best = max(self.stand(_best(hard, has_ace)), self.hit(hard, has_ace))
+            if das:
+                best = max(best, self.double(hard, has_ace))
+            ev += p * best
+        return 2 * ev
+
+    def surrender(self):
+        """Half the stake back, unless the dealer has blackjack"""
+        blackjack = self.dealer[BLACKJACK]
+        return -0.5 * (1 - blackjack) - blackjack
+
+    def action_evs(self, hard, has_ace, pair):
+        evs = [self.hit(hard, has_ace), self.stand(_best(hard, has_ace)),
+               self.double(hard, has_ace), None, None]
+        if pair is not None:
+            evs[SPLIT] = self.split(pair)
+        if self.rules.surrender:
+            evs[SURRENDER] = self.surrender()
+        return evs
+
+
+def _best(hard, has_ace):
+    return hard + 10 if has_ace and hard <= 11 else hard
+
+
+def _rows():
+    """(row, hard total, has ace, pair rank) for every table row"""
+    for total in range(4, 22):
+        yield HARD_ROW + total - 4, total, False, None
+    for total in range(12, 22):
+        yield SOFT_ROW + total - 12, total - 10, True, None
+    for rank in range(NUM_POINT_RANKS):
+        yield PAIR_ROW + rank, 2 * (rank + 1), rank == 0, rank
+
+
+def _row(hand, can_split):
+    if can_split and is_pair(hand):
+        return PAIR_ROW + point_rank(hand[0])
+    if hand.is_soft():
+        return SOFT_ROW + hand.hard - 2
+    return HARD_ROW + min(max(hand.hard, 4), 21) - 4
+
+
+def is_pair(hand):
+    """Whether a Hand is two cards of the same value, i.e. splittable"""
+    return len(hand) == 2 and hand[0].value == hand[1].value
+
+
+def _offset(row, up, action):
+    return (row * NUM_POINT_RANKS + up) * len(ACTIONS) + action